@@ -0,0 +1,105 @@
+"""
+Lazy asset loading for both games.
+Nothing is decoded at import: an asset loads the first time it is asked for,
+or earlier on a worker thread when a screen knows what comes next (prefetch).
+The packed sprite atlas is also kept on disk, already sliced and mirrored, so
+later runs skip PNG decoding entirely.
+"""
+import os, json, hashlib, struct, threading
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from engine import pack_sheets
+
+CACHE_DIR = ".asset_cache"
+CACHE_VERSION = 1
+_CACHE_HEADER = struct.Struct("<4sIII")   # magic, width, height, rows-json length
+
+def try_image(path):
+    # unconverted: the user of the image picks convert() / convert_alpha()
+    try: return pygame.image.load(path)
+    except (pygame.error, OSError): return None
+
+class AssetManager:
+    """
+    Named assets, each registered as decode() plus an optional finish(raw).
+    decode does file IO and decoding and may run on the prefetch worker;
+    finish (e.g. converting to the display format) always runs in get().
+    """
+    def __init__(self):
+        self.loaders = {}
+        self.values = {}
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.worker = None
+
+    def register(self, name, decode, finish=None):
+        self.loaders[name] = (decode, finish)
+
+    def get(self, name):
+        try:
+            return self.values[name]
+        except KeyError:
+            pass
+        decode, finish = self.loaders[name]
+        with self.lock:
+            fut = self.pending.pop(name, None)
+        raw = fut.result() if fut else decode()
+        value = finish(raw) if finish else raw
+        self.values[name] = value
+        return value
+
+    def prefetch(self, names):
+        """Start decoding names on the worker thread; get() picks the result up."""
+        with self.lock:
+            for name in names:
+                if name in self.values or name in self.pending: continue
+                if self.worker is None:
+                    self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assets")
+                self.pending[name] = self.worker.submit(self.loaders[name][0])
+
+    def proxy(self, name):
+        return LazyAsset(self, name)
+
+class LazyAsset:
+    """Stands in for a module-level asset: the first attribute access loads it."""
+    __slots__ = ("_assets", "_name")
+    def __init__(self, assets, name):
+        self._assets = assets
+        self._name = name
+    def __getattr__(self, attr):
+        return getattr(self._assets.get(self._name), attr)
+
+# ----------------- Atlas disk cache -----------------
+def _atlas_key(sheets):
+    parts = [CACHE_VERSION]
+    for name, path, fw, fh in sheets:
+        try: st = os.stat(path); stamp = (st.st_size, st.st_mtime_ns)
+        except OSError: stamp = None
+        parts.append((name, path, fw, fh, stamp))
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:16]
+
+def cached_pack(sheets, cache_dir=CACHE_DIR):
+    """pack_sheets(), served from a raw RGBA copy on disk when the source files are unchanged."""
+    path = os.path.join(cache_dir, f"atlas-{_atlas_key(sheets)}.bin")
+    try:
+        with open(path, "rb") as f:
+            magic, w, h, n = _CACHE_HEADER.unpack(f.read(_CACHE_HEADER.size))
+            if magic != b"NATL": raise ValueError(path)
+            rows = [tuple(r) for r in json.loads(f.read(n))]
+            surface = pygame.image.frombytes(f.read(), (w, h), "RGBA")
+        return surface, rows
+    except (OSError, ValueError, struct.error, pygame.error):
+        pass
+    surface, rows = pack_sheets(sheets)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        meta = json.dumps(rows).encode()
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_CACHE_HEADER.pack(b"NATL", *surface.get_size(), len(meta)))
+            f.write(meta)
+            f.write(pygame.image.tobytes(surface, "RGBA"))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return surface, rows
@@ -0,0 +1,104 @@
+"""
+Sound effects for both games.
+pre_init() asks SDL for a small mixer buffer (BUFFER frames, ~6 ms) and has
+to run before pygame.init(), which would otherwise open the mixer with its
+default, several times larger. Audio.open() then decodes every effect into a
+pygame Sound up front, falling back to a beep synthesized once per process
+when the file is missing, and reserves VOICES channels for them.
+
+play(name) during gameplay only picks a channel and starts an already decoded
+Sound: a free voice if there is one, else the oldest voice playing something
+of lower or equal priority; if every voice is busy with something more
+important the new sound is dropped. Until open() has succeeded play() is a
+shared no-op, so headless runs, the benchmark and the bots stay silent.
+"""
+import numpy as np
+import pygame
+from engine import noop
+
+FREQ = 44100
+BUFFER = 256   # frames per mixer callback: the latency floor (~5.8 ms at 44.1 kHz)
+VOICES = 8     # channels reserved for effects; music has its own stream
+
+# name -> (file, priority, fallback beep: (start Hz, end Hz, ms, wave, volume))
+SOUNDS = {
+    "coin":     ("sfx_coin.wav",     1, (990, 1480, 90, "square", 0.25)),
+    "shuriken": ("sfx_shuriken.wav", 0, (2400, 1300, 60, "noise", 0.2)),
+    "stomp":    ("sfx_stomp.wav",    2, (220, 70, 120, "square", 0.35)),
+    "hit":      ("sfx_hit.wav",      2, (520, 160, 140, "saw", 0.3)),
+    "dead":     ("sfx_dead.wav",     3, (440, 55, 450, "square", 0.35)),
+}
+
+_beeps = {}   # (spec, mixer format) -> Sound, so each beep is synthesized once
+
+def pre_init():
+    """Small-buffer mixer settings; call before pygame.init()."""
+    pygame.mixer.pre_init(FREQ, -16, 2, BUFFER)
+
+def latency_ms():
+    """Time one mixer buffer takes to play: what a sound waits at most before it starts."""
+    return BUFFER * 1000 / FREQ
+
+def beep(spec):
+    """A short chirp with a fast decay, as a Sound in the open mixer's format."""
+    fmt = pygame.mixer.get_init()
+    key = (spec, fmt)
+    snd = _beeps.get(key)
+    if snd is None:
+        f0, f1, ms, wave, volume = spec
+        rate, _, channels = fmt
+        n = int(rate * ms / 1000)
+        t = np.arange(n) / rate
+        # frequency slides geometrically from f0 to f1; phase is its running integral
+        freq = f0 * (f1 / f0) ** (t / t[-1])
+        phase = np.cumsum(freq) / rate
+        if wave == "square": w = np.sign(np.sin(2 * np.pi * phase))
+        elif wave == "saw": w = 2 * (phase % 1.0) - 1
+        else: w = np.random.default_rng(n).uniform(-1, 1, n) * np.sin(2 * np.pi * phase)
+        env = np.exp(-5 * t / t[-1]) * np.minimum(1, np.arange(n) / 64)   # 64-sample attack: no click
+        pcm = (w * env * volume * 32767).astype(np.int16)
+        snd = _beeps[key] = pygame.mixer.Sound(buffer=np.repeat(pcm[:, None], channels, 1).tobytes())
+    return snd
+
+class Audio:
+    def __init__(self, sounds=SOUNDS, voices=VOICES):
+        self.specs = sounds
+        self.voices = voices
+        self.sounds = {}   # name -> (Sound, priority)
+        self.channels = []
+        self.play = noop
+
+    def open(self):
+        """Decode every effect and reserve the voices; False (and silence) if there is no mixer."""
+        try:
+            if not pygame.mixer.get_init(): pygame.mixer.init(FREQ, -16, 2, BUFFER)
+        except pygame.error:
+            return False
+        for name, (path, priority, spec) in self.specs.items():
+            try: snd = pygame.mixer.Sound(path)
+            except (pygame.error, FileNotFoundError): snd = beep(spec)
+            self.sounds[name] = (snd, priority)
+        if pygame.mixer.get_num_channels() < self.voices: pygame.mixer.set_num_channels(self.voices)
+        pygame.mixer.set_reserved(self.voices)
+        self.channels = [pygame.mixer.Channel(i) for i in range(self.voices)]
+        self.priority = [0] * self.voices
+        self.started = [0] * self.voices   # play() count when the voice started, for oldest-first stealing
+        self.count = 0
+        self.play = self._play
+        return True
+
+    def _play(self, name):
+        snd, priority = self.sounds[name]
+        channels = self.channels
+        pick = -1
+        for i in range(self.voices):
+            if not channels[i].get_busy(): pick = i; break
+        else:
+            # every voice busy: steal the oldest of the least important, if not above us
+            prio = self.priority; started = self.started
+            for i in range(self.voices):
+                if prio[i] <= priority and (pick < 0 or (prio[i], started[i]) < (prio[pick], started[pick])): pick = i
+            if pick < 0: return
+        channels[pick].play(snd)
+        self.priority[pick] = priority
+        self.count += 1; self.started[pick] = self.count
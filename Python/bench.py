@@ -0,0 +1,228 @@
+"""
+Frame-time benchmark for both games.
+Each scenario plays a scripted session through the real step() and draw() under
+the SDL dummy driver (no window, no vsync, no clock), so numbers compare across
+builds on the same machine. Per-subsystem costs come from timing wrappers put
+around the hot functions for the duration of a run; they are inclusive and
+read per frame.
+
+    python bench.py                               # every scenario, JSON on stdout
+    python bench.py --scenarios boss,stress --enemies 2000
+    python bench.py --save-baseline bench_base.json
+    python bench.py --baseline bench_base.json    # exit status 1 on a regression
+    python bench.py --replay run.nrp              # time a recorded session too
+    python bench.py --render surface,texture --replay run.nrp   # both render backends, same inputs
+
+Frame times include presenting the frame, since the Texture backend only
+queues its copies until then. Results for every backend after the first are
+named scenario@backend; ninja_platformer only has the Surface backend.
+"""
+import os, sys, time, json, argparse, platform
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")   # stdout is the JSON report
+import numpy as np
+import engine
+engine.use_dummy_drivers()
+import pygame
+import shadow_scrolls as S, ninja_platformer as N, replay, render
+from engine import EnemyStore, scripted_inputs
+
+K = pygame
+RUN_HOP = [(20, [K.K_RIGHT]), (1, [K.K_RIGHT, K.K_UP])]
+ALL_ABILITIES = {k: True for k in S.DEFAULT_ABILITIES}
+
+# ----------------- Subsystems -----------------
+# (label, dotted name in the game module); missing names are skipped
+SUBSYSTEMS = [
+    ("input", "Player.handle_input"), ("input", "Player.wall_jump"),
+    ("physics", "Player.physics"),
+    ("coins", "CoinStore.update"), ("coins", "CoinStore.collect"),
+    ("enemies", "EnemyStore.update"), ("enemies", "EnemyStore.contact"), ("enemies", "EnemyStore.cleanup"),
+    ("projectiles", "ProjectilePool.first_hits"), ("projectiles", "ProjectilePool.hits"),
+    ("boss", "Boss.update"),
+    ("draw.background", "Parallax.draw"),
+    ("draw.world", "Platform.draw"), ("draw.world", "draw_coins"), ("draw.world", "draw_enemies"),
+    ("draw.player", "Player.draw"),
+    ("draw.hud", "draw_hud"), ("draw.hud", "Boss.draw_bar"),
+]
+
+class Timers:
+    """Wraps SUBSYSTEMS of a game module with perf_counter timers until restore()."""
+    def __init__(self, game):
+        self.total = {}
+        self.saved = []
+        for label, dotted in SUBSYSTEMS:
+            owner_name, _, attr = dotted.rpartition(".")
+            owner = getattr(game, owner_name, None) if owner_name else game
+            if isinstance(owner, type):   # time it where it is defined (e.g. engine.Parallax.draw)
+                owner = next((c for c in owner.__mro__ if attr in vars(c)), None)
+            if owner is None or attr not in vars(owner) or any(o is owner and a == attr for o, a, _ in self.saved): continue
+            fn = vars(owner)[attr]
+            self.saved.append((owner, attr, fn))
+            setattr(owner, attr, self._wrap(label, fn))
+            self.total.setdefault(label, 0.0)
+
+    def _wrap(self, label, fn):
+        total = self.total; clock = time.perf_counter
+        def timed(*a, **kw):
+            t0 = clock()
+            try: return fn(*a, **kw)
+            finally: total[label] += clock() - t0
+        return timed
+
+    def reset(self):
+        for label in self.total: self.total[label] = 0.0
+
+    def restore(self):
+        for owner, attr, fn in reversed(self.saved):
+            setattr(owner, attr, fn)
+
+# ----------------- Levels -----------------
+def crowded(level, n):
+    """Spread n patrolling enemies over the ground of a (long) level."""
+    right = max(p.rect.right for p in level.platforms) - 200
+    xs = np.linspace(600, right, n)
+    level.enemies = EnemyStore([(x, 436, x - 120, x + 120) for x in xs])
+    return level
+
+# name -> (game module, make level, key script, description)
+def scenarios(enemies):
+    return {
+        "normal": (S, lambda: S.LevelState(1, 1, S.DEFAULT_ABILITIES.copy(), 0), RUN_HOP,
+                   "shadow_scrolls world 1 level 1, run and hop"),
+        "boss": (S, lambda: S.LevelState(3, "boss", ALL_ABILITIES, 0),
+                 [(12, [K.K_RIGHT]), (1, [K.K_RIGHT, K.K_UP]), (8, [K.K_LEFT, K.K_x])],
+                 "shadow_scrolls boss arena, every ability"),
+        "shuriken": (S, lambda: S.LevelState(2, 2, ALL_ABILITIES, 0),
+                     [(6, [K.K_RIGHT, K.K_x]), (6, [K.K_LEFT, K.K_x]), (1, [K.K_UP, K.K_x])],
+                     "shadow_scrolls with three stars in flight most frames"),
+        "long": (S, lambda: S.LevelState(10, 2, ALL_ABILITIES, 0), RUN_HOP,
+                 "shadow_scrolls world 10 level 2 (45k px generated)"),
+        "stress": (S, lambda: crowded(S.LevelState(10, 2, ALL_ABILITIES, 0), enemies),
+                   RUN_HOP + [(4, [K.K_RIGHT, K.K_x])], f"{enemies} enemies over a 45k px level"),
+        "platformer": (N, lambda: N.LevelState(1), RUN_HOP, "ninja_platformer level 1, run and hop"),
+    }
+
+# ----------------- Runner -----------------
+def forever(script):
+    while True:
+        yield from scripted_inputs(script)
+
+def percentiles(ms):
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"p50_ms": round(float(p50), 4), "p95_ms": round(float(p95), 4), "p99_ms": round(float(p99), 4),
+            "mean_ms": round(float(ms.mean()), 4), "max_ms": round(float(ms.max()), 4)}
+
+def run(game, make, inputs, frames, warmup=60, backend="surface"):
+    """
+    Time `frames` frames of step()+draw()+present() after `warmup` untimed ones.
+    When the level ends (death, flag, boss down) a fresh one is built, untimed.
+    """
+    game.init_display(*([backend] if game is S else []))
+    screen = game.SCREEN
+    par = game.Parallax()
+    timers = Timers(game)
+    try:
+        level = make()
+        memory = {name: engine.footprint(v) for name, v in engine.components(level)}
+        ms = np.empty(frames)
+        step_s = draw_s = present_s = 0.0
+        clock = time.perf_counter
+        for i in range(-warmup, frames):
+            if i == 0: timers.reset()
+            keys = next(inputs, None)
+            if keys is None: break
+            t0 = clock()
+            ended = level.step(keys)
+            t1 = clock()
+            level.draw(screen, par)
+            t2 = clock()
+            screen.present()
+            t3 = clock()
+            if i >= 0:
+                ms[i] = (t3 - t0) * 1000
+                step_s += t1 - t0; draw_s += t2 - t1; present_s += t3 - t2
+            if ended: level = make()
+        n = max(i, 0) if keys is None else frames
+        ms = ms[:n]
+    finally:
+        timers.restore()
+    out = {"render": screen.name, "frames": n, **(percentiles(ms) if n else {})}
+    out["step_ms"] = round(step_s * 1000 / max(n, 1), 4)
+    out["draw_ms"] = round(draw_s * 1000 / max(n, 1), 4)
+    out["present_ms"] = round(present_s * 1000 / max(n, 1), 4)
+    out["subsystems_ms"] = {k: round(v * 1000 / max(n, 1), 4) for k, v in sorted(timers.total.items())}
+    out["entity_bytes"] = memory   # of the first level built
+    return out
+
+def replay_levels(path):
+    """Every level of a recording, as (description, make, inputs)."""
+    for meta, inputs in replay.Replay(path):
+        args = (meta["world"], meta["sublevel"], meta["abilities"], meta["score"])
+        yield f"{path}: world {args[0]} level {args[1]}", lambda args=args: S.LevelState(*args), inputs
+
+# ----------------- Baseline -----------------
+def compare(results, baseline, tolerance):
+    """Regressions: any percentile of a scenario more than `tolerance` above the baseline's."""
+    found = []
+    for name, new in results.items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old: continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if key in new and key in old and new[key] > old[key] * (1 + tolerance):
+                found.append({"scenario": name, "metric": key, "baseline": old[key], "now": new[key],
+                              "change": round(new[key] / old[key] - 1, 3)})
+    return found
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--scenarios", help="comma separated subset (default: all)")
+    ap.add_argument("--frames", type=int, default=1200)
+    ap.add_argument("--enemies", type=int, default=1000, help="enemy count for the stress scenario")
+    ap.add_argument("--replay", action="append", default=[], help="also time a recorded session")
+    ap.add_argument("--render", default="surface",
+                    help=f"comma separated render backends to time shadow_scrolls with ({', '.join(render.BACKENDS)})")
+    ap.add_argument("--out", help="write the JSON here instead of stdout")
+    ap.add_argument("--baseline", help="compare against this JSON and flag regressions")
+    ap.add_argument("--save-baseline", help="store this run as the new baseline")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before flagging (0.15 = 15%%)")
+    args = ap.parse_args(argv)
+
+    table = scenarios(args.enemies)
+    names = args.scenarios.split(",") if args.scenarios else list(table)
+    backends = args.render.split(",")
+    results = {}
+    for b, backend in enumerate(backends):
+        suffix = f"@{backend}" if b else ""
+        for name in names:
+            game, make, script, desc = table[name]
+            if b and game is not S: continue
+            key = name + suffix
+            results[key] = {"description": desc, **run(game, make, forever(script), args.frames, backend=backend)}
+            print(f"{key:>20}: p50 {results[key]['p50_ms']:.3f} ms  p95 {results[key]['p95_ms']:.3f} ms  "
+                  f"p99 {results[key]['p99_ms']:.3f} ms", file=sys.stderr)
+        for path in args.replay:
+            # each backend reads the file afresh, so every one plays the same inputs
+            for i, (desc, make, inputs) in enumerate(replay_levels(path)):
+                results[f"replay{i}{suffix}"] = {"description": desc,
+                                                 **run(S, make, inputs, S.FPS*3600, warmup=0, backend=backend)}
+
+    report = {"python": platform.python_version(), "pygame": pygame.version.ver, "numpy": np.__version__,
+              "frames": args.frames, "scenarios": results}
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(results, json.load(f), args.tolerance)
+        for r in report["regressions"]:
+            print(f"REGRESSION {r['scenario']} {r['metric']}: {r['baseline']} -> {r['now']} ms "
+                  f"({r['change']*100:+.0f}%)", file=sys.stderr)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f: f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f: f.write(text + "\n")
+    pygame.quit()
+    return 1 if report.get("regressions") else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Keyboard input per simulation tick, with latency numbers.
+feed(events) is called once per frame with what pygame.event.get() returned;
+key events for the tracked keys go into a fixed ring buffer, stamped with the
+time they were polled. tick() is called once per sim step and drains the
+buffer into a KeyState: held keys, plus every key that went down or up since
+the last tick, so a tap shorter than a frame still counts as a press.
+
+Two latencies are kept per key event: event-to-sim (polled until a sim step
+read it) and event-to-present (until the frame showing its result was
+handed to the display). Both start at the poll, not at the keypress: SDL
+gives no event timestamps, so time an event waited in SDL's queue is not
+seen. That wait is at most the gap between polls, which is reported too.
+"""
+import time, collections
+import numpy as np
+import pygame
+from engine import KeyState
+
+class InputBuffer:
+    def __init__(self, keys, size=256, history=600):
+        self.tracked = frozenset(keys)
+        self.size = size
+        # ring: key, went down, poll time; head/tail count up forever, index mod size
+        self.key = [0] * size; self.down = [False] * size; self.t = [0.0] * size
+        self.head = self.tail = 0
+        self.held = set()
+        self.state = KeyState((), ())   # reused while nothing changes
+        self.last_poll = None
+        self.shown = []   # poll times of events read by sim steps not yet on screen
+        self.sim_ms = collections.deque(maxlen=history)
+        self.present_ms = collections.deque(maxlen=history)
+        self.gap_ms = collections.deque(maxlen=history)
+
+    def feed(self, events):
+        now = time.perf_counter()
+        if self.last_poll is not None: self.gap_ms.append((now - self.last_poll) * 1000)
+        self.last_poll = now
+        for e in events:
+            if e.type in (pygame.KEYDOWN, pygame.KEYUP) and e.key in self.tracked:
+                self._push(e.key, e.type == pygame.KEYDOWN, now)
+            elif e.type == pygame.WINDOWFOCUSLOST:
+                self.sync(())   # the key-ups go to another window
+
+    def _push(self, key, down, t):
+        i = self.head % self.size
+        self.key[i] = key; self.down[i] = down; self.t[i] = t
+        self.head += 1
+        if self.head - self.tail > self.size: self.tail = self.head - self.size   # full: the oldest go
+
+    def sync(self, pressed):
+        """Forget buffered events and take held keys from pressed (after a menu ate the events)."""
+        self.tail = self.head
+        self.held = {k for k in self.tracked if pressed and pressed[k]}
+        self.state = KeyState(self.held, ())
+
+    def tick(self):
+        """The KeyState for one sim step."""
+        if self.tail == self.head: return self.state
+        now = time.perf_counter()
+        downs = set(); ups = set(); held = self.held
+        while self.tail < self.head:
+            i = self.tail % self.size
+            if self.down[i]: held.add(self.key[i]); downs.add(self.key[i])
+            else: held.discard(self.key[i]); ups.add(self.key[i])
+            self.sim_ms.append((now - self.t[i]) * 1000)
+            self.shown.append(self.t[i])
+            self.tail += 1
+        # the next step sees the keys as held only: a press or release is one step's edge
+        self.state = KeyState(held, ())
+        return KeyState(held, downs, ups)
+
+    def presented(self):
+        """Call right after the display update."""
+        if not self.shown: return
+        now = time.perf_counter()
+        for t in self.shown: self.present_ms.append((now - t) * 1000)
+        self.shown.clear()
+
+    def report(self):
+        """p50/p95/max of each latency over the kept history, in ms."""
+        out = {}
+        for name, ms in (("event_to_sim", self.sim_ms), ("event_to_present", self.present_ms),
+                         ("poll_gap", self.gap_ms)):
+            if ms:
+                p50, p95 = np.percentile(ms, [50, 95])
+                out[name] = {"samples": len(ms), "p50_ms": round(float(p50), 2),
+                             "p95_ms": round(float(p95), 2), "max_ms": round(float(max(ms)), 2)}
+        return out
@@ -0,0 +1,720 @@
+"""
+Shared helpers for ninja_platformer.py and shadow_scrolls.py.
+Nothing here opens a window or touches the display at import time.
+"""
+import os, sys, functools
+import numpy as np
+import pygame
+import render
+
+# ----------------- Headless -----------------
+def use_dummy_drivers():
+    # must run before pygame.init(); SDL then renders into memory only
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+def noop(*args):
+    """Stands in for a hook that is switched off (profiler timers, sound without a mixer)."""
+
+class KeyState:
+    """
+    Keys for one sim tick, indexed with pygame.K_* like pygame.key.get_pressed().
+    downs/ups: keys that went down/up during the tick, even if the other edge
+    followed (a tap between ticks). downs=None when only held states are known
+    (scripted input, the Gym env): edges is then False and the player takes a
+    key held now but not last tick as pressed.
+    """
+    __slots__ = ("held", "downs", "ups", "edges")
+    def __init__(self, held=(), downs=None, ups=()):
+        self.held = frozenset(held)
+        self.edges = downs is not None
+        self.downs = frozenset(downs or ())
+        self.ups = frozenset(ups)
+    def __getitem__(self, key):
+        return key in self.held
+    def pressed(self, key):
+        return key in self.downs
+    def released(self, key):
+        return key in self.ups
+
+NO_KEYS = KeyState()
+
+def scripted_inputs(script):
+    """
+    Expand [(frames, keys), ...] into one KeyState per frame,
+    e.g. [(30, [K_RIGHT]), (1, [K_RIGHT, K_UP])].
+    """
+    for frames, keys in script:
+        state = KeyState(keys)
+        for _ in range(frames):
+            yield state
+
+# ----------------- Static Geometry Index -----------------
+class SpatialHash:
+    """
+    Uniform grid over static rects (anything with a .rect), built once per level.
+    query() only looks at the cells a rect touches, so collision cost stays flat
+    however long the level is. Iterating yields every item in build order.
+    """
+    def __init__(self, items, cell=128):
+        self.items = list(items)
+        self.cell = cell
+        self.cells = {}
+        for i, it in enumerate(self.items):
+            r = it.rect
+            for cx in range(r.left//cell, (r.right-1)//cell + 1):
+                for cy in range(r.top//cell, (r.bottom-1)//cell + 1):
+                    self.cells.setdefault((cx, cy), []).append(i)
+
+    def __iter__(self): return iter(self.items)
+    def __len__(self): return len(self.items)
+
+    def query(self, rect):
+        """Items whose cells overlap rect, in build order (so resolution order matches a full scan)."""
+        c = self.cell
+        x0 = rect.left//c; x1 = (rect.right-1)//c
+        y0 = rect.top//c;  y1 = (rect.bottom-1)//c
+        if x0 == x1 and y0 == y1:
+            return [self.items[i] for i in self.cells.get((x0, y0), ())]
+        hits = set()
+        for cx in range(x0, x1+1):
+            for cy in range(y0, y1+1):
+                hits.update(self.cells.get((cx, cy), ()))
+        return [self.items[i] for i in sorted(hits)]
+
+def sweep(rect, dx, dy, grid):
+    """
+    Swept-AABB move of rect by (dx, 0) or (0, dy) against the grid's rects.
+    Every rect in the path gets its entry distance along the move (negative
+    if rect already overlaps it); rect stops flush against the nearest one,
+    so nothing is skipped however far the move. dx/dy may be fractional: the
+    distance moved is int() of them, as for a plain move. rect is moved in
+    place; returns the item hit, or None.
+    """
+    d = int(dx or dy)
+    if not d: return None
+    r = rect
+    near = grid.query(r.union(r.move(d, 0) if dx else r.move(0, d)))
+    best = None; first = d if d > 0 else -d
+    for it in near:
+        p = it.rect
+        if dx:
+            if not (p.top < r.bottom and p.bottom > r.top): continue
+            entry, through = (p.left - r.right, p.right - r.left) if d > 0 else (r.left - p.right, r.right - p.left)
+        else:
+            if not (p.left < r.right and p.right > r.left): continue
+            entry, through = (p.top - r.bottom, p.bottom - r.top) if d > 0 else (r.top - p.bottom, r.bottom - p.top)
+        if entry < first and through > 0:
+            best = it; first = entry
+    if best is None:
+        if dx: r.x += d
+        else: r.y += d
+        return None
+    p = best.rect
+    if dx:
+        if d > 0: r.right = p.left
+        else: r.left = p.right
+    else:
+        if d > 0: r.bottom = p.top
+        else: r.top = p.bottom
+    return best
+
+# ----------------- Entities -----------------
+# Entity classes shared by both games. They declare __slots__, so an instance
+# is a fixed block of fields with no per-object __dict__; subclasses list
+# their extra fields the same way. Bulk entities (coins, enemies, stars) are
+# numpy stores further down. Every kind is listed in COMPONENTS so tools can
+# find them on a level without knowing which game it came from.
+COMPONENTS = {}
+
+def component(cls):
+    """Class decorator: list cls in COMPONENTS as module.name."""
+    COMPONENTS[f"{cls.__module__}.{cls.__name__}"] = cls
+    return cls
+
+def components(obj):
+    """(attribute, value) for every registered component on obj, lists of them included."""
+    kinds = tuple(COMPONENTS.values())
+    for name in sorted(vars(obj)):
+        v = getattr(obj, name)
+        if isinstance(v, kinds) or (isinstance(v, list) and v and isinstance(v[0], kinds)):
+            yield name, v
+
+def footprint(v):
+    """Approximate bytes held by a component (or a list of them): numpy columns, or slots and their values."""
+    if isinstance(v, list): return sum(footprint(x) for x in v)
+    arrays = [a for a in getattr(v, "__dict__", {}).values() if isinstance(a, np.ndarray)]
+    if arrays: return sys.getsizeof(v) + sum(a.nbytes for a in arrays)
+    size = sys.getsizeof(v)
+    for cls in type(v).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            x = getattr(v, name, None)
+            if isinstance(x, pygame.Rect): size += sys.getsizeof(x)
+    return size
+
+@component
+class Platform:
+    __slots__ = ("rect",)
+    COLOR = (60, 170, 70)
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+
+    def draw(self, surf, camx):
+        r = self.rect
+        surf.rect(self.COLOR, (r.x - camx, r.y, r.w, r.h))
+
+class Actor:
+    """A moving box: the fields and helpers both games' players share."""
+    __slots__ = ("rect", "vx", "vy", "facing_left", "on_ground", "can_double", "anim_t")
+
+    def __init__(self, x, y, w=40, h=46):
+        self.rect = pygame.Rect(x, y, w, h)
+        self.vx = 0; self.vy = 0
+        self.facing_left = False
+        self.on_ground = False
+        self.can_double = True
+        self.anim_t = 0
+
+    def feet(self):
+        # stomp hitbox: a strip along the soles
+        return pygame.Rect(self.rect.x+6, self.rect.bottom-6, self.rect.w-12, 8)
+
+# ----------------- Camera / Viewport -----------------
+class Camera:
+    """
+    Horizontal-scrolling viewport. visible() hands back only what overlaps the
+    screen (plus margin), so draw cost follows what is on screen, not level length.
+    """
+    def __init__(self, width, height, margin=64):
+        self.w = width; self.h = height
+        self.margin = margin
+        self.x = 0
+        self._update_view()
+
+    def _update_view(self):
+        m = self.margin
+        self.left = self.x - m; self.right = self.x + self.w + m
+        self.top = -m; self.bottom = self.h + m
+
+    def follow(self, rect):
+        # keep the target centred, never scrolling left of the level start
+        self.x = max(0, int(rect.centerx - self.w*0.5))
+        self._update_view()
+
+    def sees(self, rect):
+        return (rect.right > self.left and rect.left < self.right and
+                rect.bottom > self.top and rect.top < self.bottom)
+
+    def view_rect(self):
+        return pygame.Rect(self.left, self.top, self.right-self.left, self.bottom-self.top)
+
+    def visible(self, items):
+        """Items (with a .rect) on screen; a SpatialHash is answered from its grid."""
+        if hasattr(items, "query"):
+            items = items.query(self.view_rect())
+        return [it for it in items if self.sees(it.rect)]
+
+    def visible_rows(self, store):
+        """Row indices of an entity store (EnemyStore, CoinStore) that are on screen."""
+        return np.flatnonzero(store.hits(self.view_rect())).tolist()
+
+# ----------------- Text -----------------
+_fonts = {}
+
+def get_font(size, name=None):
+    # SysFont walks the system font list on every call; do that once per (name, size)
+    font = _fonts.get((name, size))
+    if font is None:
+        font = _fonts[(name, size)] = pygame.font.SysFont(name, size)
+    return font
+
+@functools.lru_cache(maxsize=256)
+def render_text(text, size, color, name=None):
+    """
+    Rendered, antialiased label. Same (text, size, color) returns the same Surface,
+    so static labels render once and changing ones (score) only when the value does.
+    Callers must not draw on the result.
+    """
+    return get_font(size, name).render(text, True, color)
+
+# ----------------- Sprite Atlas -----------------
+def pack_sheets(sheets):
+    """
+    Decode sprite-sheet strips and pack them into one surface: each sheet gets a
+    row of right-facing frames with its mirrored copy underneath.
+    sheets: [(name, path, frame_w, frame_h), ...]; a missing file is an empty sheet.
+    Returns (surface, rows) with rows [(name, fw, fh, frames, y), ...]. Needs no
+    display, so it can run on a loader thread.
+    """
+    strips = []
+    for name, path, fw, fh in sheets:
+        try: img = pygame.image.load(path)
+        except (pygame.error, OSError): img = None
+        n = img.get_width()//fw if img and img.get_height() >= fh else 0
+        strips.append((name, img, fw, fh, n))
+    width = max([fw*n for _, _, fw, _, n in strips] + [1])
+    height = max(sum(2*fh for _, _, _, fh, n in strips if n), 1)
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    rows = []
+    y = 0
+    for name, img, fw, fh, n in strips:
+        if n:
+            strip = img.subsurface((0, 0, fw*n, fh))
+            surface.blit(strip, (0, y))
+            surface.blit(pygame.transform.flip(strip, True, False), (0, y+fh))
+        rows.append((name, fw, fh, n, y))
+        y += 2*fh if n else 0
+    return surface, rows
+
+class SpriteAtlas:
+    """
+    All sprite-sheet strips packed into one texture (see pack_sheets), with
+    every (sheet, frame, facing) cut as a subsurface up front, so drawing a
+    sprite is a lookup with no per-frame allocation or transform.
+    """
+    def __init__(self, surface, rows):
+        self.surface = surface
+        if pygame.display.get_surface():
+            self.surface = self.surface.convert_alpha()
+        self.frames = {}
+        for name, fw, fh, n, y in rows:
+            right = [self.surface.subsurface((i*fw, y, fw, fh)) for i in range(n)]
+            # mirroring the strip also reverses frame order
+            left = [self.surface.subsurface(((n-1-i)*fw, y+fh, fw, fh)) for i in range(n)]
+            self.frames[name] = (right, left)
+        self.effects = {}
+
+    @classmethod
+    def load(cls, sheets):
+        return cls(*pack_sheets(sheets))
+
+    def has(self, name):
+        return bool(self.frames[name][0])
+
+    def count(self, name):
+        return len(self.frames[name][0])
+
+    def frame(self, name, i, left=False):
+        """Frame i (wrapped) of sheet name, facing left if asked."""
+        frames = self.frames[name][1 if left else 0]
+        return frames[i % len(frames)]
+
+    def variant(self, name, i, left, effect):
+        """
+        Effect copy of a frame (see EFFECTS), built the first time it is asked for
+        and kept, so a shader-like effect costs one extra blit per frame after that.
+        """
+        frames = self.frames[name][1 if left else 0]
+        key = (name, i % len(frames), left, effect)
+        surf = self.effects.get(key)
+        if surf is None:
+            surf = self.effects[key] = make_effect(frames[key[1]], effect)
+        return surf
+
+    def warm(self, effects, names=None):
+        # build variants up front (e.g. when an ability unlocks) instead of on first draw
+        for name in names or self.frames:
+            for i in range(self.count(name)):
+                for left in (False, True):
+                    for effect in effects:
+                        self.variant(name, i, left, effect)
+
+# ----------------- Sprite Effects -----------------
+# effect -> (rgb, alpha): glow is an enlarged soft underlay, silhouette a flat
+# see-through shape, flash a brightened copy for damage blinks
+EFFECTS = {
+    "glow":       ((120,60,200), 150),
+    "silhouette": ((50,50,80), 110),
+    "flash":      ((180,180,180), 255),
+}
+GLOW_PAD = 3
+
+def make_effect(img, effect):
+    rgb, alpha = EFFECTS[effect]
+    out = img.copy()
+    if effect == "flash":
+        out.fill(rgb, special_flags=pygame.BLEND_RGB_ADD)
+        return out
+    # flatten to the tint colour, keeping the sprite's own alpha as the shape
+    out.fill((0,0,0), special_flags=pygame.BLEND_RGB_MULT)
+    out.fill(rgb, special_flags=pygame.BLEND_RGB_ADD)
+    out.fill((255,255,255,alpha), special_flags=pygame.BLEND_RGBA_MULT)
+    if effect == "glow":
+        w, h = out.get_size()
+        out = pygame.transform.smoothscale(out, (w + 2*GLOW_PAD, h + 2*GLOW_PAD))
+    return out
+
+@functools.lru_cache(maxsize=32)
+def tinted_box(w, h, rgba):
+    # translucent rectangle for art-less fallbacks, made once per size/colour
+    box = pygame.Surface((w, h), pygame.SRCALPHA)
+    box.fill(rgba)
+    return box
+
+# ----------------- Parallax -----------------
+def is_opaque(img):
+    if not img.get_flags() & pygame.SRCALPHA and img.get_colorkey() is None:
+        return True
+    w, h = img.get_size()
+    return pygame.mask.from_surface(img, 254).count() == w*h
+
+class Parallax:
+    """
+    Tiled background layers scrolling at (layer, speed) rates.
+    Prepared once: opaque layers lose their alpha channel, runs of layers sharing
+    a speed and width are flattened into one strip, and anything under a
+    full-height opaque layer is dropped. draw() then blits only the tiles that
+    intersect the screen.
+    """
+    def __init__(self, layers, width, height, fill=(120,180,255)):
+        self.w = width; self.h = height
+        self.fill = fill
+        prepared = []
+        for img, speed in layers:
+            if not img: continue
+            if prepared and prepared[-1][1] == speed and prepared[-1][0].get_width() == img.get_width():
+                base = prepared[-1][0]
+                flat = pygame.Surface((base.get_width(), max(base.get_height(), img.get_height())), pygame.SRCALPHA)
+                flat.blit(base, (0, 0)); flat.blit(img, (0, 0))
+                prepared[-1] = (flat, speed)
+            else:
+                prepared.append((img, speed))
+        self.layers = []
+        for img, speed in prepared:
+            opaque = is_opaque(img)
+            if pygame.display.get_surface():
+                img = img.convert() if opaque else img.convert_alpha()
+            if opaque and img.get_height() >= height:
+                self.layers = []   # covers everything drawn so far
+            self.layers.append((img, speed))
+        # a full-height opaque bottom layer makes the clear redundant
+        first = self.layers[0][0] if self.layers else None
+        self.needs_fill = not (first and is_opaque(first) and first.get_height() >= height)
+
+    def draw(self, surf, camx):
+        if self.needs_fill: surf.fill(self.fill)
+        sw = self.w
+        for img, speed in self.layers:
+            w = img.get_width()
+            x = - (camx * speed) % w
+            k = -1 if x > 0 else 0
+            while x + k*w < sw:
+                surf.blit(img, (x + k*w, 0))
+                k += 1
+
+# ----------------- Idle Screens -----------------
+IDLE_POLL_MS = 500
+
+def run_screen(draw, on_key=None, tick_ms=0, duration_ms=None):
+    """
+    Event-driven loop for menus and static screens. Sleeps in pygame.event.wait
+    instead of spinning, and redraws only after a key press or an animation tick.
+      draw(full) paints the screen (all of it when full is True) and returns the
+                 rects it changed, or None for the whole screen
+      on_key(e)  returns a value to leave the screen with, or None to stay
+      tick_ms    animation period; 0 for a static screen
+      duration_ms  leave with None after this long
+    """
+    start = pygame.time.get_ticks()
+    next_tick = start + tick_ms
+    draw(True)
+    render.update()
+    while True:
+        now = pygame.time.get_ticks()
+        wait = IDLE_POLL_MS
+        if tick_ms: wait = min(wait, next_tick - now)
+        if duration_ms is not None: wait = min(wait, start + duration_ms - now)
+        e = pygame.event.wait(max(1, wait))
+        dirty = full = False
+        while e.type != pygame.NOEVENT:
+            if e.type == pygame.QUIT:
+                pygame.quit(); sys.exit()
+            if e.type == pygame.KEYDOWN:
+                result = on_key(e) if on_key else None
+                if result is not None: return result
+                dirty = True
+            elif e.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                full = True
+            e = pygame.event.poll()
+        now = pygame.time.get_ticks()
+        if duration_ms is not None and now - start >= duration_ms:
+            return None
+        if tick_ms and now >= next_tick:
+            dirty = True
+            next_tick = now + tick_ms
+        if full:
+            draw(True); render.update()
+        elif dirty:
+            render.update(draw(False))
+
+# ----------------- Entity Stores -----------------
+# Enemies and coins live as parallel numpy arrays (structure of arrays), one
+# row per entity, so updates and overlap tests run once over the whole level
+# instead of once per Python object. Rows stay in spawn order.
+# The price is numpy's fixed cost per call: an overlap test takes ~11 us at any
+# row count, where a loop over Rects takes ~0.5 us per entity, so the arrays
+# only win from ~250 rows (1000 rows: 8 us against 43 us). The shipped levels
+# have 7-65 enemies and 19-149 coins and step slower than they did as objects;
+# the layout is kept because parking, the projectile pool and the batched
+# environments are built on whole-column operations.
+def _round_half_away(v):
+    # what pygame.Rect does when a float is added to an int coordinate
+    return np.trunc(v + np.copysign(0.5, v))
+
+class _Store:
+    W = H = 0
+    COLUMNS = ()
+
+    def __len__(self):
+        return len(self.x)
+
+    def hits(self, rect, h=None):
+        """Bool mask of rows whose box overlaps rect (Rect.colliderect rules); h overrides box height."""
+        h = self.H if h is None else h
+        return ((self.x < rect.right) & (self.x + self.W > rect.left) &
+                (self.y < rect.bottom) & (self.y + h > rect.top))
+
+    def keep(self, mask):
+        # drop rows where mask is False; arrays are rebuilt only when something goes
+        if not mask.all():
+            for name in self.COLUMNS:
+                setattr(self, name, getattr(self, name)[mask])
+
+@component
+class CoinStore(_Store):
+    W = H = 24
+    COLUMNS = ("x", "y", "t")
+
+    def __init__(self, positions=()):
+        a = np.array(positions, float).reshape(-1, 2)
+        self.x = a[:,0].copy(); self.y = a[:,1].copy()
+        self.t = np.zeros(len(a), int)   # animation clock
+
+    def update(self):
+        self.t += 1
+
+    def collect(self, rect):
+        """Remove every coin touching rect; returns how many."""
+        got = self.hits(rect)
+        n = int(got.sum())
+        if n: self.keep(~got)
+        return n
+
+@component
+class EnemyStore(_Store):
+    """
+    Patrolling enemies. update(window) simulates in full only the rows whose
+    patrol can reach the window; the rest are parked. A parked walker moves
+    back and forth between fixed turning points by a whole step each tick, so
+    its position is a triangle wave of the tick count: it is worked out in
+    closed form when the row comes back in range, exactly where stepping it
+    every tick would have put it. Rows whose walk is not that clean (a speed
+    that rounds differently each way, a start off the grid, a stomped body)
+    simply stay awake.
+    """
+    W, H = 40, 44
+    HEAD = 10
+    COLUMNS = ("x", "y", "vx", "l", "r", "stomped", "t", "parked", "L", "n", "u0")
+    PLAN_SLACK = 512   # px the window may move before the awake set is worked out again
+
+    def __init__(self, rows=(), vx=2):
+        # rows: (x, y, left_bound, right_bound)
+        a = np.array(rows, float).reshape(-1, 4)
+        self.x = a[:,0].copy(); self.y = a[:,1].copy()
+        self.l = a[:,2].copy(); self.r = a[:,3].copy()
+        self.vx = np.full(len(a), float(vx))
+        self.stomped = np.zeros(len(a), bool)
+        self.t = np.zeros(len(a), int)   # frames since stomped
+        # parked rows: left turning point, half period in ticks, phase at tick 0
+        self.parked = np.zeros(len(a), bool)
+        self.L = np.zeros(len(a)); self.n = np.zeros(len(a)); self.u0 = np.zeros(len(a))
+        self.clock = 0   # update() calls so far
+        self.plan = None   # (left, right, awake rows) the parked set was chosen for
+
+    def update(self, window=None):
+        """One patrol tick. window: (left, right) x range that must be exact, or None for every row."""
+        plan = self.plan
+        if window is None:
+            if plan: self.wake(np.flatnonzero(self.parked)); self.plan = plan = None
+        elif plan and (window[0] < plan[0] or window[1] > plan[1]):
+            plan = self.replan(window)   # a jump: wake what it reaches before stepping
+        if plan is None:
+            walk = ~self.stomped
+            self.x[walk] = _round_half_away(self.x[walk] + self.vx[walk])
+            turn = walk & ((self.x < self.l) | (self.x > self.r))
+            self.vx[turn] *= -1
+            self.t[self.stomped] += 1
+        else:
+            # the same tick over the awake rows only
+            a = plan[2]
+            dead = self.stomped[a]
+            walk = a[~dead]
+            x = self.x[walk] = _round_half_away(self.x[walk] + self.vx[walk])
+            self.vx[walk[(x < self.l[walk]) | (x > self.r[walk])]] *= -1
+            self.t[a[dead]] += 1
+        self.clock += 1
+        # re-plan after the tick, while the window is still well inside: rows are on whole px by now
+        half = self.PLAN_SLACK // 2
+        if window is not None and (plan is None or window[0] - half < plan[0] or window[1] + half > plan[1]):
+            self.replan(window)
+
+    def replan(self, window):
+        """Wake every row whose patrol comes near the window, park the awake ones that can be parked."""
+        left, right = window[0] - self.PLAN_SLACK, window[1] + self.PLAN_SLACK
+        v = np.abs(self.vx)
+        near = (self.l - v - 1 < right) & (self.r + v + 1 + self.W > left)
+        self.wake(np.flatnonzero(near & self.parked))
+        self.park(np.flatnonzero(~near & ~self.parked))
+        self.plan = (left, right, np.flatnonzero(~self.parked))
+        return self.plan
+
+    def park(self, rows):
+        x = self.x[rows]; l = self.l[rows]; r = self.r[rows]; v = np.abs(self.vx[rows])
+        s = np.floor(v + 0.5)   # whole px per tick to the right; to the left it is ceil(v - 0.5)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            R = x + s * (np.floor((r - x) / s) + 1)   # first step past r: turn there
+            L = x - s * (np.floor((x - l) / s) + 1)   # first step short of l
+        ok = (~self.stomped[rows] & (s > 0) & (s == np.ceil(v - 0.5)) & (x == np.floor(x)) &
+              (x >= l) & (x <= r) & (R - s >= l) & (L + s <= r) & (L >= 1))
+        rows = rows[ok]; x = x[ok]; s = s[ok]; R = R[ok]; L = L[ok]
+        n = (R - L) / s
+        u = np.where(self.vx[rows] > 0, (x - L) / s, n + (R - x) / s)   # ticks into the cycle
+        self.L[rows] = L; self.n[rows] = n; self.u0[rows] = (u - self.clock) % (2 * n)
+        self.parked[rows] = True
+
+    def patrol(self, rows):
+        """Where parked rows are now: (x, heading right), from the triangle wave."""
+        n = self.n[rows]
+        u = (self.u0[rows] + self.clock) % (2 * n)
+        return self.L[rows] + np.floor(np.abs(self.vx[rows]) + 0.5) * (n - np.abs(u - n)), u < n
+
+    def wake(self, rows):
+        if not len(rows): return
+        v = np.abs(self.vx[rows])
+        self.x[rows], right = self.patrol(rows)
+        self.vx[rows] = np.where(right, v, -v)
+        self.parked[rows] = False
+
+    def current(self):
+        """(x, vx) of every row as of now, parked ones included (their columns are stale)."""
+        rows = np.flatnonzero(self.parked)
+        if not len(rows): return self.x, self.vx
+        x = self.x.copy(); vx = self.vx.copy()
+        v = np.abs(vx[rows])
+        x[rows], right = self.patrol(rows)
+        vx[rows] = np.where(right, v, -v)
+        return x, vx
+
+    def keep(self, mask):
+        if self.plan and not mask.all():
+            # renumber the awake rows that stay
+            left, right, awake = self.plan
+            self.plan = (left, right, (np.cumsum(mask) - 1)[awake[mask[awake]]])
+        super().keep(mask)
+
+    def contact(self, feet, body, falling, can_die=True):
+        """
+        Player against every walking enemy, with the same outcome as checking
+        them one by one in row order: the first head under a falling player's
+        feet is stomped (the bounce ends further stomps), and any other body
+        touched kills. Returns (stomped_row or -1, killed).
+        """
+        walk = ~self.stomped
+        touch = walk & self.hits(body) if can_die else np.zeros(len(self), bool)
+        j = -1
+        if falling:
+            heads = np.flatnonzero(walk & self.hits(feet, self.HEAD))
+            if len(heads): j = int(heads[0])
+        if j >= 0:
+            if touch[:j].any(): return -1, True
+            self.stomped[j] = True
+            touch[j] = False
+        return j, bool(touch.any())
+
+    def cleanup(self, after):
+        # stomped bodies linger for `after` frames
+        self.keep(~(self.stomped & (self.t > after)))
+
+# ----------------- Projectiles -----------------
+_NO_HITS = np.full(0, -1)   # first_hits() with nothing in flight; shared, so read-only
+_NO_HITS.flags.writeable = False
+@component
+class ProjectilePool:
+    """
+    Fixed-capacity projectile storage: columns are allocated once and live
+    projectiles are packed into rows 0..n-1. Spawning fills the next row,
+    removal swaps the last live row into the hole, and every projectile
+    expires after `life` frames instead of flying on forever.
+    """
+    def __init__(self, capacity=256, w=10, h=4, life=120):
+        self.w = w; self.h = h; self.life = life
+        self.x = np.zeros(capacity); self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.ttl = np.zeros(capacity, int)
+        self.n = 0
+
+    def __len__(self):
+        return self.n
+
+    def spawn(self, x, y, vx):
+        i = self.n
+        if i == len(self.x): return False
+        self.x[i] = x; self.y[i] = y; self.vx[i] = vx; self.ttl[i] = self.life
+        self.n = i + 1
+        return True
+
+    def remove(self, mask):
+        """Swap-remove the live rows where mask (length n) is True."""
+        if not mask.any(): return
+        for i in np.flatnonzero(mask)[::-1].tolist():
+            last = self.n - 1
+            if i != last:
+                self.x[i] = self.x[last]; self.y[i] = self.y[last]
+                self.vx[i] = self.vx[last]; self.ttl[i] = self.ttl[last]
+            self.n = last
+
+    def update(self):
+        n = self.n
+        if not n: return   # the usual case: nothing in flight
+        self.x[:n] += self.vx[:n]
+        self.ttl[:n] -= 1
+        self.remove(self.ttl[:n] <= 0)
+
+    def hits(self, rect):
+        """Mask of live projectiles overlapping rect."""
+        n = self.n
+        x = self.x[:n]; y = self.y[:n]
+        return (x < rect.right) & (x + self.w > rect.left) & (y < rect.bottom) & (y + self.h > rect.top)
+
+    def first_hits(self, store):
+        """
+        One batched pass against an entity store: for each live projectile the
+        first row it overlaps, or -1. Only rows within the projectiles' x span
+        are tested, so a long level's far-away entities cost nothing.
+        """
+        n = self.n
+        if not n: return _NO_HITS
+        first = np.full(n, -1)
+        if not len(store): return first
+        x = self.x[:n]; y = self.y[:n]
+        near = np.flatnonzero((store.x < x.max() + self.w) & (store.x + store.W > x.min()))
+        if not len(near): return first
+        ex = store.x[near]; ey = store.y[near]
+        m = ((x[:,None] < ex + store.W) & (x[:,None] + self.w > ex) &
+             (y[:,None] < ey + store.H) & (y[:,None] + self.h > ey))
+        hit = m.any(1)
+        first[hit] = near[m.argmax(1)[hit]]
+        return first
+
+    def span(self):
+        """(left, right) x extent of the live projectiles; call only when there are some."""
+        x = self.x[:self.n]
+        return float(x.min()), float(x.max()) + self.w
+
+    def rows(self, left, right, back=0.0):
+        """(x, y) of live projectiles whose x lies in [left - w, right), `back` updates ago."""
+        n = self.n
+        x = self.x[:n] - self.vx[:n] * back if back else self.x[:n]
+        on = np.flatnonzero((x > left - self.w) & (x < right))
+        return zip(x[on].tolist(), self.y[on].tolist())
@@ -0,0 +1,149 @@
+"""
+Seeded level generator for shadow_scrolls.
+generate(world, sublevel, seed) lays out a long run of ground with pits, floating
+platforms, coins and patrolling enemies, shaped by the world's theme. The same
+key always gives the same level. LevelCache keeps generated levels in memory and
+in .level_cache/ on disk, and can build the next stage on a worker thread while
+the current one is played.
+
+A level is a dict of numpy arrays, ready for the engine stores:
+  platforms (N, 4) x, y, w, h    coins (M, 2) x, y
+  enemies   (K, 4) x, y, l, r    vx ()  enemy speed    flag (4,) x, y, w, h
+"""
+import os, random, threading, collections
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+VERSION = 2   # bump whenever generate() changes, so old caches are not reused
+CACHE_DIR = ".level_cache"
+FIELDS = ("platforms", "coins", "enemies", "vx", "flag")   # order of the arrays in a cache file
+
+# Player reach with the default abilities (see shadow_scrolls physics):
+# a single jump clears ~200 px flat and rises ~120 px, a double jump ~220 px up.
+GROUND_Y, GROUND_H = 480, 60
+MAX_PIT = 160
+FLOAT_Y = (300, 420)
+
+# per world: pits (chance a ground segment ends in a pit), floats (chance of a
+# floating platform over a segment), rise (how high floats climb, 0..1), enemies
+# (per segment), speed (enemy walk speed), length (px, sublevel 1; 2 is 1.5x)
+THEMES = [
+    dict(name="Bamboo Forest",     pits=0.15, floats=0.5, rise=0.3, enemies=0.30, speed=2.0, length=12000),
+    dict(name="Night Temple",      pits=0.25, floats=0.5, rise=0.4, enemies=0.40, speed=2.1, length=14000),
+    dict(name="Volcanic Caverns",  pits=0.45, floats=0.4, rise=0.4, enemies=0.40, speed=2.2, length=16000),
+    dict(name="Misty Graveyard",   pits=0.25, floats=0.6, rise=0.5, enemies=0.55, speed=2.3, length=18000),
+    dict(name="Flooded Ruins",     pits=0.50, floats=0.7, rise=0.2, enemies=0.40, speed=2.4, length=20000),
+    dict(name="Floating Dojo",     pits=0.60, floats=0.9, rise=0.7, enemies=0.45, speed=2.5, length=22000),
+    dict(name="Thunder Peaks",     pits=0.40, floats=0.7, rise=1.0, enemies=0.50, speed=2.6, length=24000),
+    dict(name="Ancient Caves",     pits=0.35, floats=0.5, rise=0.6, enemies=0.65, speed=2.7, length=26000),
+    dict(name="Crumbling Temple",  pits=0.55, floats=0.6, rise=0.7, enemies=0.60, speed=2.8, length=28000),
+    dict(name="Shadow Realm",      pits=0.55, floats=0.8, rise=0.9, enemies=0.70, speed=2.9, length=30000),
+]
+
+def generate(world, sublevel, seed=0, length=None):
+    """One level for (world, sublevel, seed); length overrides the theme's (in px)."""
+    theme = THEMES[world-1]
+    rng = random.Random(f"{world}:{sublevel}:{seed}")
+    end = length or int(theme["length"] * (1.5 if sublevel == 2 else 1))
+    platforms = []; coins = []; enemies = []
+
+    # a safe start: the player spawns at x=100 on flat ground
+    x = -200
+    seg_w = 900
+    float_end = 0   # right edge of the last floating climb: climbs never overlap
+    while True:
+        seg_w = min(seg_w, end + 400 - x)
+        left, right = x, x + seg_w
+        platforms.append((left, GROUND_Y, seg_w, GROUND_H))
+        if left > 400 and seg_w >= 240 and rng.random() < theme["enemies"]:
+            ex = rng.randint(left + 40, right - 120)
+            enemies.append((ex, GROUND_Y - 44, left + 10, right - 50))
+        if left > 0 and rng.random() < theme["floats"]:
+            # a short climb of floating platforms, coins on each
+            fx = max(left + rng.randint(0, max(0, seg_w - 200)), float_end + 80)
+            fy = FLOAT_Y[1] - rng.randint(0, int((FLOAT_Y[1] - FLOAT_Y[0]) * theme["rise"]))
+            for _ in range(rng.randint(1, 3)):
+                fw = rng.choice((140, 180, 200, 240))
+                if fx + fw > end - 120: break   # keep the flag in the open
+                platforms.append((fx, fy, fw, 16))
+                coins.append((fx + fw // 2 - 12, fy - 40))
+                if fw >= 200 and rng.random() < theme["enemies"] / 2:
+                    enemies.append((fx + 20, fy - 44, fx, fx + fw - 40))
+                float_end = fx + fw
+                fx += fw + rng.randint(40, 140)
+                fy = max(FLOAT_Y[0], min(FLOAT_Y[1], fy + rng.randint(-70, 50)))
+        elif left + seg_w // 2 > float_end + 40 and rng.random() < 0.5:
+            coins.append((left + seg_w // 2, GROUND_Y - 100))
+        x = right
+        if x >= end + 200: break
+        if x < end - 400 and rng.random() < theme["pits"]:   # never a pit under the flag
+            pit = rng.randint(60, MAX_PIT)
+            coins.append((x + pit // 2 - 12, GROUND_Y - 150))   # over the pit: reward the jump
+            x += pit
+        seg_w = rng.randint(240, 900)
+
+    return {
+        "platforms": np.array(platforms, np.int32).reshape(-1, 4),
+        "coins": np.array(coins, float).reshape(-1, 2),
+        "enemies": np.array(enemies, float).reshape(-1, 4),
+        "vx": np.array(theme["speed"]),
+        "flag": np.array((end, GROUND_Y - 60, 20, 60), np.int32),
+    }
+
+class LevelCache:
+    """
+    get() answers from memory, then disk, then generate(); prefetch() runs that
+    on a worker so the level is ready when the player gets there.
+    """
+    def __init__(self, cache_dir=CACHE_DIR, keep=8):
+        self.cache_dir = cache_dir
+        self.keep = keep
+        self.levels = collections.OrderedDict()
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.worker = None
+
+    def path(self, key):
+        world, sublevel, seed = key
+        return os.path.join(self.cache_dir, f"v{VERSION}-w{world}-{sublevel}-s{seed}.npy")
+
+    def get(self, world, sublevel, seed=0):
+        key = (world, sublevel, seed)
+        with self.lock:
+            level = self.levels.get(key)
+            if level is not None:
+                self.levels.move_to_end(key)
+                return level
+            fut = self.pending.pop(key, None)
+        level = fut.result() if fut else self._load(key)
+        with self.lock:
+            self.levels[key] = level
+            while len(self.levels) > self.keep: self.levels.popitem(last=False)
+        return level
+
+    def prefetch(self, world, sublevel, seed=0):
+        key = (world, sublevel, seed)
+        with self.lock:
+            if key in self.levels or key in self.pending: return
+            if self.worker is None:
+                self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="levelgen")
+            self.pending[key] = self.worker.submit(self._load, key)
+
+    def _load(self, key):
+        path = self.path(key)
+        try:
+            # the arrays back to back in .npy format: no zip directory to parse
+            with open(path, "rb") as f:
+                return {name: np.load(f, allow_pickle=False) for name in FIELDS}
+        except (OSError, ValueError, EOFError):
+            pass
+        level = generate(*key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                for name in FIELDS: np.save(f, level[name])
+            os.replace(tmp, path)
+        except OSError:
+            pass
+        return level
@@ -0,0 +1,242 @@
+"""
+Gym-style environments over shadow_scrolls levels, for bots and automated playtesting.
+NinjaEnv runs one LevelState headless: reset(world, sublevel, seed) and
+step(action) -> (obs, reward, done, info). An action is a bitmask over
+ACTION_KEYS (the replay key order), so recorded sessions and bot actions are
+the same thing. The observation is a fixed float32 vector
+(see OBS_FIELDS): the player, the nearest enemies and coins, and the goal,
+positions relative to the player.
+
+VecEnv steps n of them in lockstep, in this process or split over worker
+processes. Observations, rewards and done flags live in one shared-memory
+block the workers write into, so a step only sends actions and the rare
+end-of-episode info down the pipes. Finished instances start over at once.
+
+    env = NinjaEnv(); obs = env.reset(1, 1, seed=0)
+    obs, reward, done, info = env.step(1 << 1)            # hold RIGHT
+    venv = VecEnv(64, levels=[(w, 1, 0) for w in range(1, 5)], workers=4)
+    obs = venv.reset(); obs, rewards, dones, infos = venv.step(actions)
+"""
+import os
+import multiprocessing as mp
+from multiprocessing import shared_memory
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import numpy as np
+import shadow_scrolls as S, replay
+from engine import KeyState
+
+# bit i of an action is ACTION_KEYS[i], the same as the held bits of a replay mask
+ACTION_KEYS = replay.KEYS
+N_ACTIONS = 1 << len(ACTION_KEYS)
+
+N_ENEMIES = 8   # nearest walking enemies in the observation
+N_COINS = 4     # nearest coins
+OBS_FIELDS = (["x", "y", "vx", "vy", "on_ground", "can_double", "dash_cd", "focus"]
+              + [f"enemy{i}.{k}" for i in range(N_ENEMIES) for k in ("dx", "dy", "vx", "present")]
+              + [f"coin{i}.{k}" for i in range(N_COINS) for k in ("dx", "dy", "present")]
+              + ["goal.dx", "goal.dy", "boss_hp"])
+OBS_SIZE = len(OBS_FIELDS)
+_E0 = 8; _C0 = _E0 + 4 * N_ENEMIES; _G0 = _C0 + 3 * N_COINS
+
+# reward: score gained, plus new ground covered to the right, plus the ending
+PROGRESS_REWARD = 0.01   # per px
+END_REWARD = {"win": 100.0, "boss_down": 100.0, "dead": -10.0}
+
+class Actions:
+    """Action mask -> KeyState, built once per mask."""
+    def __init__(self):
+        self.keys = {}
+
+    def __getitem__(self, mask):
+        keys = self.keys.get(mask)
+        if keys is None:
+            keys = self.keys[mask] = KeyState(k for i, k in enumerate(ACTION_KEYS) if mask >> i & 1)
+        return keys
+
+class NinjaEnv:
+    """
+    One level, stepped by hand. frame_skip repeats each action that many frames
+    (rewards summed); an episode is cut after max_frames with info["truncated"].
+    abilities default to what a player has on entering the world.
+    """
+    def __init__(self, frame_skip=1, max_frames=S.FPS * 300, abilities=None):
+        self.frame_skip = frame_skip
+        self.max_frames = max_frames
+        self.fixed_abilities = abilities
+        self.actions = Actions()
+        self.obs = np.zeros(OBS_SIZE, np.float32)
+        self.level = None
+
+    def reset(self, world=1, sublevel=1, seed=S.LEVEL_SEED):
+        ab = self.fixed_abilities or S.abilities_for(world)
+        self.key = (world, sublevel, seed)
+        self.level = S.LevelState(world, sublevel, ab.copy(), 0, seed)
+        self.best_x = self.level.player.rect.x
+        self.done = False
+        return self.observe()
+
+    def step(self, action):
+        level = self.level
+        if self.done: raise RuntimeError("step() after the episode ended; call reset()")
+        keys = self.actions[int(action)]
+        score = level.score
+        result = None
+        for _ in range(self.frame_skip):
+            result = level.step(keys)
+            if result: break
+        x = level.player.rect.x
+        reward = float(level.score - score) + PROGRESS_REWARD * max(0, x - self.best_x)
+        self.best_x = max(self.best_x, x)
+        info = {}
+        if result:
+            reward += END_REWARD.get(result[0], 0.0)
+            info = {"result": result[0], "score": result[1]}
+        elif level.frame >= self.max_frames:
+            info = {"result": None, "score": level.score, "truncated": True}
+        if info:
+            self.done = True
+            info.update(frames=level.frame, level=self.key)
+        return self.observe(), reward, self.done, info
+
+    def observe(self, out=None):
+        """Fill out (a float32 row of OBS_SIZE, default the env's own) from the level."""
+        o = self.obs if out is None else out
+        level = self.level; p = level.player; px, py = p.rect.x, p.rect.y
+        o[:_E0] = (px, py, p.vx, p.vy, p.on_ground, p.can_double, p.dash_cd, p.focus)
+
+        o[_E0:] = 0
+        e = level.enemies
+        walk = np.flatnonzero(~e.stomped)
+        if len(walk):
+            ex, evx = e.current()
+            dx = ex[walk] - px; dy = e.y[walk] - py
+            near = _nearest(np.abs(dx) + np.abs(dy), N_ENEMIES)
+            rows = o[_E0:_E0 + 4 * len(near)].reshape(-1, 4)
+            rows[:, 0] = dx[near]; rows[:, 1] = dy[near]; rows[:, 2] = evx[walk[near]]; rows[:, 3] = 1
+        c = level.coins
+        if len(c):
+            dx = c.x - px; dy = c.y - py
+            near = _nearest(np.abs(dx) + np.abs(dy), N_COINS)
+            rows = o[_C0:_C0 + 3 * len(near)].reshape(-1, 3)
+            rows[:, 0] = dx[near]; rows[:, 1] = dy[near]; rows[:, 2] = 1
+
+        goal = level.flag_rect or (level.boss.rect if level.boss else None)
+        if goal: o[_G0:_G0 + 2] = (goal.x - px, goal.y - py)
+        if level.boss: o[_G0 + 2] = max(level.boss.hp, 0)
+        return o
+
+def _nearest(dist, k):
+    """Indices of the k smallest, closest first."""
+    if len(dist) > k: idx = np.argpartition(dist, k)[:k]
+    else: idx = np.arange(len(dist))
+    return idx[np.argsort(dist[idx], kind="stable")]
+
+# ----------------- Batches -----------------
+class _Block:
+    """Envs lo..hi of a batch, writing into the batch's obs/reward/done arrays."""
+    def __init__(self, lo, hi, levels, env_kw, obs, reward, done):
+        self.lo, self.hi = lo, hi
+        self.levels = [levels[i % len(levels)] for i in range(lo, hi)]
+        self.envs = [NinjaEnv(**env_kw) for _ in range(lo, hi)]
+        self.obs, self.reward, self.done = obs, reward, done
+
+    def reset(self):
+        for i, (env, key) in enumerate(zip(self.envs, self.levels), self.lo):
+            env.reset(*key); env.observe(self.obs[i])
+        self.reward[self.lo:self.hi] = 0; self.done[self.lo:self.hi] = False
+
+    def step(self, actions):
+        """actions for lo..hi; returns [(index, info)] for the envs that finished (and restarted)."""
+        ended = []
+        for i, (env, action) in enumerate(zip(self.envs, actions), self.lo):
+            _, r, d, info = env.step(action)
+            self.reward[i] = r; self.done[i] = d
+            if d:
+                info["final_obs"] = env.obs.copy()
+                env.reset(*self.levels[i - self.lo])
+                ended.append((i, info))
+            env.observe(self.obs[i])
+        return ended
+
+def _views(buf, n):
+    obs = np.ndarray((n, OBS_SIZE), np.float32, buf)
+    reward = np.ndarray(n, np.float32, buf, offset=obs.nbytes)
+    done = np.ndarray(n, bool, buf, offset=obs.nbytes + reward.nbytes)
+    return obs, reward, done
+
+def _worker(conn, name, n, lo, hi, levels, env_kw):
+    # workers share the parent's resource tracker, so the block is unlinked once, by close()
+    shm = shared_memory.SharedMemory(name=name)
+    block = _Block(lo, hi, levels, env_kw, *_views(shm.buf, n))
+    try:
+        while True:
+            cmd, arg = conn.recv()
+            if cmd == "step": conn.send(block.step(arg))
+            elif cmd == "reset": block.reset(); conn.send(None)
+            else: break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del block
+        shm.close()
+
+class VecEnv:
+    """
+    n NinjaEnvs stepped in lockstep. levels: one (world, sublevel, seed) or a
+    list of them, dealt out round-robin. workers=0 steps everything in this
+    process; otherwise the envs are split over that many processes.
+    The arrays step() returns are the shared buffers themselves: the next
+    step overwrites them, so copy what has to outlive it.
+    """
+    def __init__(self, n, levels=(1, 1, S.LEVEL_SEED), workers=0, **env_kw):
+        levels = [tuple(levels)] if isinstance(levels[0], int) else [tuple(k) for k in levels]
+        self.n = n
+        self.actions = np.zeros(n, np.int64)
+        nbytes = n * (OBS_SIZE * 4 + 4 + 1)
+        self.shm = None; self.procs = []; self.conns = []; self.block = None
+        if workers:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self.obs, self.reward, self.done = _views(self.shm.buf, n)
+            bounds = np.linspace(0, n, min(workers, n) + 1).astype(int)
+            self.slices = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+            for lo, hi in self.slices:
+                parent, child = mp.Pipe()
+                proc = mp.Process(target=_worker, args=(child, self.shm.name, n, lo, hi, levels, env_kw), daemon=True)
+                proc.start(); child.close()
+                self.procs.append(proc); self.conns.append(parent)
+        else:
+            self.obs, self.reward, self.done = _views(bytearray(nbytes), n)
+            self.block = _Block(0, n, levels, env_kw, self.obs, self.reward, self.done)
+
+    def reset(self):
+        if self.block: self.block.reset()
+        else:
+            for conn in self.conns: conn.send(("reset", None))
+            for conn in self.conns: conn.recv()
+        return self.obs
+
+    def step(self, actions):
+        """Returns (obs (n, OBS_SIZE), rewards (n,), dones (n,), infos {index: info} of finished envs)."""
+        actions = np.asarray(actions).tolist()
+        if self.block: ended = self.block.step(actions)
+        else:
+            # every worker gets its slice before any is waited on
+            for conn, (lo, hi) in zip(self.conns, self.slices): conn.send(("step", actions[lo:hi]))
+            ended = [e for conn in self.conns for e in conn.recv()]
+        return self.obs, self.reward, self.done, dict(ended)
+
+    def close(self):
+        for conn in self.conns:
+            try: conn.send(("close", None))
+            except OSError: pass
+        for proc in self.procs: proc.join(5)
+        self.procs = []; self.conns = []
+        if self.shm:
+            del self.obs, self.reward, self.done
+            self.shm.close(); self.shm.unlink(); self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
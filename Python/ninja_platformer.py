@@ -1,11 +1,24 @@
-import pygame, sys, os, math
+import time
+STARTUP_T0 = time.perf_counter()
+import pygame, sys, functools
+import engine, audio, render
+from engine import NO_KEYS, Actor, Camera, CoinStore, EnemyStore, Platform, SpatialHash, SpriteAtlas, render_text, run_screen, scripted_inputs
+from assets import AssetManager, cached_pack, try_image
 
-pygame.init()
 WIDTH, HEIGHT = 960, 540
-window = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Ninja Platformer")
+window = None   # opened by init_display(); importing this module opens nothing
+SCREEN = None   # render backend levels draw through (always the Surface one here)
 clock = pygame.time.Clock()
 
+def init_display():
+    global window, SCREEN
+    if window is None:
+        audio.pre_init()   # small mixer buffer: must precede pygame.init()
+        pygame.init()
+        window, SCREEN = render.open("surface", (WIDTH, HEIGHT), "Ninja Platformer")
+        SFX.open()
+    return window
+
 # ------------------ Settings ------------------
 FPS = 60
 GRAVITY = 0.6
@@ -14,122 +27,79 @@ JUMP_POWER = -12
 DOUBLE_JUMP_POWER = -11
 TILE = 48
 
-# ------------------ Load Helpers ------------------
-def load_sheet(path, fw, fh):
-    img = pygame.image.load(path).convert_alpha()
-    frames_across = img.get_width() // fw
-    frames = []
-    for i in range(frames_across):
-        surf = pygame.Surface((fw, fh), pygame.SRCALPHA)
-        surf.blit(img, (0,0), pygame.Rect(i*fw, 0, fw, fh))
-        frames.append(surf)
-    return frames
-
-def safe_load(path, fw=None, fh=None):
-    if not os.path.exists(path):
-        return None
-    if fw and fh:
-        return load_sheet(path, fw, fh)
-    return pygame.image.load(path).convert_alpha()
-
 # ------------------ Assets ------------------
-IDLE = load_sheet("player_idle.png", 48, 48) or []
-RUN  = load_sheet("player_run.png", 48, 48) or []
-JUMP = load_sheet("player_jump.png", 48, 48) or []
-DJMP = load_sheet("player_doublejump.png", 48, 48) or []
-EWALK = load_sheet("enemy_walk.png", 48, 48) or []
-ESTOMP = load_sheet("enemy_stomp.png", 48, 48) or []
-COIN = load_sheet("coin.png", 32, 32) or []
-
-BG_SKY = safe_load("bg_sky.png")
-BG_MTN = safe_load("bg_mountains.png")
-BG_TRE = safe_load("bg_trees.png")
-BG_GRASS = safe_load("bg_grass.png")
+# Nothing is decoded at import; the menu prefetches the level assets on a worker
+ASSETS = AssetManager()
+
+SHEETS = [
+    ("IDLE", "player_idle.png", 48, 48),
+    ("RUN", "player_run.png", 48, 48),
+    ("JUMP", "player_jump.png", 48, 48),
+    ("DJMP", "player_doublejump.png", 48, 48),
+    ("EWALK", "enemy_walk.png", 48, 48),
+    ("ESTOMP", "enemy_stomp.png", 48, 48),
+    ("COIN", "coin.png", 32, 32),
+]
+# All sheets packed into one texture, left-facing copies precomputed (and cached on disk)
+ASSETS.register("atlas", functools.partial(cached_pack, SHEETS), lambda packed: SpriteAtlas(*packed))
+ATLAS = ASSETS.proxy("atlas")
+
+# backgrounds stay unconverted here; Parallax decides between convert() and convert_alpha()
+for _name in ("bg_sky", "bg_mountains", "bg_trees", "bg_grass"):
+    ASSETS.register(_name, functools.partial(try_image, _name + ".png"))
+LEVEL_ASSETS = ("atlas", "bg_sky", "bg_mountains", "bg_trees", "bg_grass")
 
 # Music (WAV recommended for broad support)
-try:
-    pygame.mixer.music.load("bg_music.wav")
-    pygame.mixer.music.set_volume(0.5)
-except Exception as e:
-    print("Music not loaded:", e)
+def load_music():
+    try:
+        pygame.mixer.music.load("bg_music.wav")
+        pygame.mixer.music.set_volume(0.5)
+        return True
+    except Exception as e:
+        print("Music not loaded:", e)
+        return False
+ASSETS.register("music", load_music)
+
+# Sound effects, shared with shadow_scrolls: decoded when the display opens
+SFX = audio.Audio()
 
 # ------------------ Classes ------------------
-class Parallax:
+class Parallax(engine.Parallax):
     def __init__(self):
-        self.layers = [
-            (BG_SKY, 0.1),
-            (BG_MTN, 0.3),
-            (BG_TRE, 0.6),
-            (BG_GRASS, 0.9),
-        ]
-    def draw(self, surf, camera_x):
-        surf.fill((120,180,255))
-        for img, speed in self.layers:
-            if not img: continue
-            w = img.get_width()
-            # tile horizontally
-            x = - (camera_x * speed) % w
-            surf.blit(img, (x - w, 0))
-            surf.blit(img, (x, 0))
-            surf.blit(img, (x + w, 0))
-
-class Platform:
-    def __init__(self, rect):
-        self.rect = pygame.Rect(rect)
-    def draw(self, surf, camx):
-        pygame.draw.rect(surf, (60,170,70), (self.rect.x - camx, self.rect.y, self.rect.w, self.rect.h))
+        super().__init__([
+            (ASSETS.get("bg_sky"), 0.1),
+            (ASSETS.get("bg_mountains"), 0.3),
+            (ASSETS.get("bg_trees"), 0.6),
+            (ASSETS.get("bg_grass"), 0.9),
+        ], WIDTH, HEIGHT)
 
-class Coin:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 24, 24)
-        self.t = 0
-    def update(self):
-        self.t += 1
-    def draw(self, surf, camx):
-        if COIN:
-            frame = COIN[(self.t//6) % len(COIN)]
-            surf.blit(frame, (self.rect.x - camx - 4, self.rect.y - 4))
+# Platforms are engine.Platform; coins and enemies are rows of engine.CoinStore / engine.EnemyStore
+def draw_coins(surf, coins, camx, rows):
+    xs, ys, ts = coins.x[rows].tolist(), coins.y[rows].tolist(), coins.t[rows].tolist()
+    for x, y, t in zip(xs, ys, ts):
+        if ATLAS.has("COIN"):
+            surf.blit(ATLAS.frame("COIN", t//6), (x - camx - 4, y - 4))
         else:
-            pygame.draw.circle(surf, (255,215,0), (self.rect.x - camx + 12, self.rect.y + 12), 12)
-    def collect(self, player):
-        return self.rect.colliderect(player.rect)
-
-class Enemy:
-    def __init__(self, x, y, left_bound, right_bound):
-        self.rect = pygame.Rect(x, y, 40, 44)
-        self.vx = 2
-        self.left = left_bound
-        self.right = right_bound
-        self.stomped = False
-        self.t = 0
-    def update(self):
-        if self.stomped:
-            self.t += 1
-            return
-        self.rect.x += self.vx
-        if self.rect.x < self.left or self.rect.x > self.right:
-            self.vx *= -1
-    def draw(self, surf, camx):
-        if self.stomped and ESTOMP:
-            surf.blit(ESTOMP[0], (self.rect.x - camx - 4, self.rect.y - 4))
-        elif EWALK:
-            frame = EWALK[(pygame.time.get_ticks()//120) % len(EWALK)]
-            flip = self.vx < 0
-            img = pygame.transform.flip(frame, flip, False) if flip else frame
-            surf.blit(img, (self.rect.x - camx - 4, self.rect.y - 4))
+            surf.circle((255,215,0), (x - camx + 12, y + 12), 12)
+
+def draw_enemies(surf, enemies, camx, rows):
+    frame = pygame.time.get_ticks()//120
+    xs, ys = enemies.x[rows].tolist(), enemies.y[rows].tolist()
+    vxs, stomped = enemies.vx[rows].tolist(), enemies.stomped[rows].tolist()
+    for x, y, vx, dead in zip(xs, ys, vxs, stomped):
+        if dead and ATLAS.has("ESTOMP"):
+            surf.blit(ATLAS.frame("ESTOMP", 0), (x - camx - 4, y - 4))
+        elif ATLAS.has("EWALK"):
+            surf.blit(ATLAS.frame("EWALK", frame, vx < 0), (x - camx - 4, y - 4))
         else:
-            pygame.draw.rect(surf, (200,50,50), (self.rect.x - camx, self.rect.y, self.rect.w, self.rect.h))
+            surf.rect((200,50,50), (x - camx, y, EnemyStore.W, EnemyStore.H))
 
-class Player:
+@engine.component
+class Player(Actor):
+    __slots__ = ("state",)
     def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 40, 46)
-        self.vx = 0
-        self.vy = 0
-        self.on_ground = False
-        self.can_double = True
-        self.facing_left = False
+        super().__init__(x, y)
         self.state = "idle"
-        self.anim_t = 0
     def handle_input(self, keys):
         self.vx = 0
         if keys[pygame.K_LEFT]:
@@ -146,10 +116,12 @@ class Player:
             elif self.can_double:
                 self.vy = DOUBLE_JUMP_POWER
                 self.can_double = False
-    def physics(self, platforms):
+    def physics(self, grid):
+        # grid: SpatialHash of the level's platforms; only look at ones the move can touch
         # horizontal
+        near = grid.query(self.rect.union(self.rect.move(self.vx, 0)))
         self.rect.x += self.vx
-        for p in platforms:
+        for p in near:
             if self.rect.colliderect(p.rect):
                 if self.vx > 0:
                     self.rect.right = p.rect.left
@@ -157,9 +129,13 @@ class Player:
                     self.rect.left = p.rect.right
         # vertical
         self.vy += GRAVITY
-        self.rect.y += self.vy
+        # the query box has to round vy the way the move does: a Rect rounds a float
+        # coordinate half away from zero, while Rect.move() truncates the offset
+        moved = self.rect.copy(); moved.y += self.vy
+        near = grid.query(self.rect.union(moved))
+        self.rect.y = moved.y
         self.on_ground = False
-        for p in platforms:
+        for p in near:
             if self.rect.colliderect(p.rect):
                 if self.vy > 0:
                     self.rect.bottom = p.rect.top
@@ -169,11 +145,6 @@ class Player:
                 elif self.vy < 0:
                     self.rect.top = p.rect.bottom
                     self.vy = 0
-    def stomp_enemy(self, enemy):
-        # if falling and feet hit enemy top -> stomp
-        feet = pygame.Rect(self.rect.x+6, self.rect.bottom-6, self.rect.w-12, 8)
-        head = pygame.Rect(enemy.rect.x, enemy.rect.y, enemy.rect.w, 10)
-        return self.vy > 0 and feet.colliderect(head)
     def update_anim(self):
         if not self.on_ground:
             self.state = "jump"
@@ -185,22 +156,22 @@ class Player:
         self.anim_t += 1
     def draw(self, surf, camx):
         img = None
-        if self.state == "idle" and IDLE:
-            img = IDLE[(self.anim_t//10) % len(IDLE)]
-        elif self.state == "run" and RUN:
-            img = RUN[(self.anim_t//6) % len(RUN)]
-        elif self.state == "jump" and JUMP:
+        left = self.facing_left
+        if self.state == "idle" and ATLAS.has("IDLE"):
+            img = ATLAS.frame("IDLE", self.anim_t//10, left)
+        elif self.state == "run" and ATLAS.has("RUN"):
+            img = ATLAS.frame("RUN", self.anim_t//6, left)
+        elif self.state == "jump" and ATLAS.has("JUMP"):
             # show double-jump frame if we already used it
-            if not self.can_double and DJMP:
-                img = DJMP[0]
+            if not self.can_double and ATLAS.has("DJMP"):
+                img = ATLAS.frame("DJMP", 0, left)
             else:
-                img = JUMP[0]
+                img = ATLAS.frame("JUMP", 0, left)
         if img:
-            draw = pygame.transform.flip(img, self.facing_left, False)
-            surf.blit(draw, (self.rect.x - camx - 4, self.rect.y - 2))
+            surf.blit(img, (self.rect.x - camx - 4, self.rect.y - 2))
         else:
             # fallback box
-            pygame.draw.rect(surf, (80,80,255), (self.rect.x - camx, self.rect.y, self.rect.w, self.rect.h))
+            surf.rect((80,80,255), (self.rect.x - camx, self.rect.y, self.rect.w, self.rect.h))
 
 # ------------------ Level ------------------
 def build_level():
@@ -213,155 +184,189 @@ def build_level():
         Platform((1300, 300, 180, 18)),
         Platform((1600, 420, 220, 18)),
     ]
-    coins = [
-        Coin(230, 360), Coin(460, 300), Coin(740, 280),
-        Coin(1010, 320), Coin(1330, 260), Coin(1650, 380)
-    ]
-    enemies = [
-        Enemy(560, 436, 520, 780),
-        Enemy(1180, 436, 1120, 1400),
-        Enemy(1520, 376, 1480, 1750),
-    ]
+    coins = CoinStore([
+        (230, 360), (460, 300), (740, 280),
+        (1010, 320), (1330, 260), (1650, 380)
+    ])
+    enemies = EnemyStore([
+        (560, 436, 520, 780),
+        (1180, 436, 1120, 1400),
+        (1520, 376, 1480, 1750),
+    ])
     # Level end flag
     flag_rect = pygame.Rect(2000, 420, 20, 60)
     return platforms, coins, enemies, flag_rect
 
 # ------------------ Screens ------------------
 def draw_text_center(surf, txt, size, color, y):
-    font = pygame.font.SysFont(None, size)
-    img = font.render(txt, True, color)
+    img = render_text(txt, size, color)
     x = (WIDTH - img.get_width())//2
     surf.blit(img, (x, y))
 
-def main_menu():
+def draw_main_menu(full=True):
     window.fill((15,15,25))
     draw_text_center(window, "NINJA PLATFORMER", 64, (255,255,255), 150)
     draw_text_center(window, "Press ENTER to Start", 36, (200,220,255), 260)
     draw_text_center(window, "Use Arrow Keys (← → to move, ↑ to jump/double jump)", 26, (200,200,200), 320)
     draw_text_center(window, "Stomp enemies by landing on their head", 26, (200,200,200), 350)
-    pygame.display.update()
+
+def main_menu():
+    # decode the level's art while the player reads the menu
+    ASSETS.prefetch(LEVEL_ASSETS)
     # start music
     try:
-        if not pygame.mixer.music.get_busy():
+        if ASSETS.get("music") and not pygame.mixer.music.get_busy():
             pygame.mixer.music.play(-1)
     except: pass
-    # wait for enter
-    while True:
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT: pygame.quit(); sys.exit()
-            if e.type == pygame.KEYDOWN and e.key == pygame.K_RETURN:
-                return
+    # wait for enter (sleeps in event.wait, no busy loop)
+    run_screen(draw_main_menu, lambda e: True if e.key == pygame.K_RETURN else None)
 
 def level_intro(level_num):
-    t=0
-    while t<90:
+    def draw(full):
         window.fill((0,0,0))
         draw_text_center(window, f"Level {level_num}", 56, (255,255,255), HEIGHT//2-40)
-        pygame.display.update()
-        clock.tick(FPS)
-        t+=1
+    run_screen(draw, duration_ms=90*1000//FPS)
 
 def game_over_screen(score):
-    window.fill((10,10,20))
-    draw_text_center(window, "GAME OVER", 64, (255,80,80), 160)
-    draw_text_center(window, f"Score: {score}", 40, (255,255,255), 240)
-    draw_text_center(window, "Press R to Retry  |  Press Q to Quit", 28, (220,220,220), 320)
-    pygame.display.update()
-    while True:
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT: pygame.quit(); sys.exit()
-            if e.type == pygame.KEYDOWN:
-                if e.key == pygame.K_r: return "retry"
-                if e.key == pygame.K_q: return "quit"
+    def draw(full):
+        window.fill((10,10,20))
+        draw_text_center(window, "GAME OVER", 64, (255,80,80), 160)
+        draw_text_center(window, f"Score: {score}", 40, (255,255,255), 240)
+        draw_text_center(window, "Press R to Retry  |  Press Q to Quit", 28, (220,220,220), 320)
+    def on_key(e):
+        if e.key == pygame.K_r: return "retry"
+        if e.key == pygame.K_q: return "quit"
+    return run_screen(draw, on_key)
 
 def level_complete_screen(level_num, score):
-    window.fill((10,20,10))
-    draw_text_center(window, f"Level {level_num} Complete!", 56, (180,255,180), 160)
-    draw_text_center(window, f"Score: {score}", 40, (255,255,255), 240)
-    draw_text_center(window, "Press ENTER for next level", 28, (220,220,220), 320)
-    pygame.display.update()
-    while True:
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT: pygame.quit(); sys.exit()
-            if e.type == pygame.KEYDOWN and e.key == pygame.K_RETURN:
-                return
+    def draw(full):
+        window.fill((10,20,10))
+        draw_text_center(window, f"Level {level_num} Complete!", 56, (180,255,180), 160)
+        draw_text_center(window, f"Score: {score}", 40, (255,255,255), 240)
+        draw_text_center(window, "Press ENTER for next level", 28, (220,220,220), 320)
+    run_screen(draw, lambda e: True if e.key == pygame.K_RETURN else None)
 
-# ------------------ Game Loop ------------------
-def run_level(level_num=1):
-    parallax = Parallax()
-    platforms, coins, enemies, flag_rect = build_level()
-    player = Player(100, 380)
-    score = 0
-    camera_x = 0
-    running = True
-    while running:
-        dt = clock.tick(FPS)
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+# ------------------ Simulation Core ------------------
+class LevelState:
+    """
+    One level's world state, advanced one fixed 1/FPS tick per step().
+    step() never draws or waits on the clock, so it can run headless.
+    """
+    def __init__(self, level_num=1):
+        self.level_num = level_num
+        self.platforms, self.coins, self.enemies, self.flag_rect = build_level()
+        self.grid = SpatialHash(self.platforms)
+        self.player = Player(100, 380)
+        self.score = 0
+        self.camera = Camera(WIDTH, HEIGHT)
+        self.frame = 0
 
-        keys = pygame.key.get_pressed()
+    def step(self, keys):
+        """Advance one tick; keys is anything indexable by pygame.K_*. Returns (result, score) once the level ends."""
+        player = self.player
+        self.frame += 1
         player.handle_input(keys)
-        player.physics(platforms)
+        player.physics(self.grid)
 
-        # Coins
-        for c in coins[:]:
-            c.update()
-            if c.collect(player):
-                coins.remove(c)
-                score += 1
+        # Coins (vectorized over the whole store)
+        self.coins.update()
+        got = self.coins.collect(player.rect)
+        if got:
+            self.score += got
+            SFX.play("coin")
 
         # Enemies
-        for en in enemies[:]:
-            en.update()
-            if en.stomped:
-                # remove after a bit
-                if en.t > 30:
-                    enemies.remove(en)
-                continue
-            if player.stomp_enemy(en):
-                en.stomped = True
-                player.vy = JUMP_POWER * 0.6  # bounce
-                score += 5
-            elif player.rect.colliderect(en.rect):
-                return ("dead", score)
+        self.enemies.update()
+        stomped, killed = self.enemies.contact(player.feet(), player.rect, player.vy > 0)
+        if stomped >= 0:
+            player.vy = JUMP_POWER * 0.6  # bounce
+            self.score += 5
+            SFX.play("stomp")
+        if killed:
+            return ("dead", self.score)
+        # remove stomped ones after a bit
+        self.enemies.cleanup(30)
 
         # Level complete?
-        if player.rect.colliderect(flag_rect):
-            return ("complete", score)
+        if player.rect.colliderect(self.flag_rect):
+            return ("complete", self.score)
 
         player.update_anim()
 
         # Camera follows
-        camera_x = max(0, int(player.rect.centerx - WIDTH*0.5))
+        self.camera.follow(player.rect)
+        return None
 
-        # Draw
-        parallax.draw(window, camera_x)
+    def draw(self, surf, parallax):
+        # every world pass only touches what the camera can see
+        cam = self.camera
+        camera_x = cam.x
+        flag_rect = self.flag_rect
+        parallax.draw(surf, camera_x)
         # Platforms
-        for p in platforms:
-            p.draw(window, camera_x)
+        for p in cam.visible(self.grid):
+            p.draw(surf, camera_x)
         # Flag
-        pygame.draw.rect(window, (255,255,255), (flag_rect.x - camera_x, flag_rect.y - 40, 4, 100))
-        pygame.draw.polygon(window, (255,0,0), [(flag_rect.x - camera_x+4, flag_rect.y - 40),
-                                                (flag_rect.x - camera_x+44, flag_rect.y - 20),
-                                                (flag_rect.x - camera_x+4, flag_rect.y   )])
+        if cam.sees(flag_rect.inflate(48, 80)):
+            surf.rect((255,255,255), (flag_rect.x - camera_x, flag_rect.y - 40, 4, 100))
+            surf.polygon((255,0,0), [(flag_rect.x - camera_x+4, flag_rect.y - 40),
+                                     (flag_rect.x - camera_x+44, flag_rect.y - 20),
+                                     (flag_rect.x - camera_x+4, flag_rect.y   )])
         # Coins
-        for c in coins:
-            c.draw(window, camera_x)
+        draw_coins(surf, self.coins, camera_x, cam.visible_rows(self.coins))
         # Enemies
-        for en in enemies:
-            en.draw(window, camera_x)
+        draw_enemies(surf, self.enemies, camera_x, cam.visible_rows(self.enemies))
         # Player
-        player.draw(window, camera_x)
+        self.player.draw(surf, camera_x)
 
         # HUD
-        font = pygame.font.SysFont(None, 30)
-        window.blit(font.render(f"Score: {score}", True, (0,0,0)), (12,12))
+        surf.blit(render_text(f"Score: {self.score}", 30, (0,0,0)), (12,12))
 
-        pygame.display.update()
+def simulate_level(level_num=1, inputs=(), max_frames=FPS*600):
+    """
+    Headless run of one level: no drawing, no clock, no event pump.
+    inputs yields one key state per frame (see engine.scripted_inputs); once it runs dry no keys are held.
+    Returns (result, score, frames); result is "timeout" if max_frames pass first.
+    """
+    level = LevelState(level_num)
+    inputs = iter(inputs)
+    while level.frame < max_frames:
+        result = level.step(next(inputs, NO_KEYS))
+        if result:
+            return result + (level.frame,)
+    return ("timeout", level.score, level.frame)
+
+# ------------------ Game Loop ------------------
+def run_level(level_num=1):
+    parallax = Parallax()
+    level = LevelState(level_num)
+    running = True
+    while running:
+        dt = clock.tick(FPS)
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT:
+                pygame.quit(); sys.exit()
+
+        result = level.step(pygame.key.get_pressed())
+        if result:
+            if result[0] == "dead": SFX.play("dead")
+            return result
+
+        # Draw
+        level.draw(SCREEN, parallax)
+        SCREEN.present()
 
 # ------------------ Main ------------------
+def startup_time():
+    """--startup-time: show the main menu once, print how long that took since import began, and exit."""
+    init_display()
+    draw_main_menu()
+    render.update()
+    print(f"startup: {(time.perf_counter()-STARTUP_T0)*1000:.0f} ms to main menu")
+    pygame.quit()
+
 def main():
+    init_display()
     main_menu()
     level = 1
     while True:
@@ -380,5 +385,19 @@ def main():
     pygame.quit()
     sys.exit()
 
+def headless_main(args):
+    """python ninja_platformer.py --headless [frames]: run right and hop, print the outcome."""
+    frames = int(args[0]) if args else FPS*60
+    script = [(20, [pygame.K_RIGHT]), (1, [pygame.K_RIGHT, pygame.K_UP])] * (frames//21 + 1)
+    t0 = time.perf_counter()
+    result, score, n = simulate_level(1, scripted_inputs(script), frames)
+    dt = time.perf_counter() - t0
+    print(f"{result}: score {score} after {n} frames ({n/max(dt,1e-9):.0f} frames/s)")
+
 if __name__ == "__main__":
-    main()
+    if "--headless" in sys.argv:
+        headless_main([a for a in sys.argv[1:] if a != "--headless"])
+    elif "--startup-time" in sys.argv:
+        startup_time()
+    else:
+        main()
@@ -0,0 +1,120 @@
+"""
+Per-frame phase timing.
+The game loop calls begin(), lap(name) after each phase and end(). While the
+profiler is off those three are a shared no-op, so the calls can stay in the
+shipped game; turning it on (F3 in a level, or --profile FILE) swaps in the
+real timers. The last `history` frames are kept for the overlay and for export.
+"""
+import json, time, collections, itertools
+import numpy as np
+import pygame
+from engine import get_font, noop, tinted_box
+
+class Profiler:
+    GRAPH_FRAMES = 240
+    BUDGET_MS = 1000 / 60
+
+    def __init__(self, history=3600):
+        self.frames = collections.deque(maxlen=history)   # (total_ms, {phase: ms})
+        self.phases = []   # phase names in first-seen order, for stable columns
+        self.count = 0   # frames recorded so far; unlike len(frames) it keeps going once the deque is full
+        self.overlay = False
+        self.panel = None
+        self.enable(False)
+
+    def enable(self, on=True):
+        self.enabled = on
+        if on:
+            self.begin, self.lap, self.end = self._begin, self._lap, self._end
+            self._begin()   # switched on mid-frame: time from here
+        else: self.begin = self.lap = self.end = noop
+
+    def toggle_overlay(self, keep_recording=False):
+        """F3: show/hide the overlay; recording follows it unless something else asked for it."""
+        self.overlay = not self.overlay
+        self.enable(self.overlay or keep_recording)
+        self.panel = None
+
+    # ----------------- Timing -----------------
+    def _begin(self):
+        self.cur = {}
+        self.t0 = self.last = time.perf_counter()
+
+    def _lap(self, name):
+        t = time.perf_counter()
+        cur = self.cur
+        cur[name] = cur.get(name, 0.0) + (t - self.last) * 1000
+        self.last = t
+
+    def _end(self):
+        total = (time.perf_counter() - self.t0) * 1000
+        for name in self.cur:
+            if name not in self.phases: self.phases.append(name)
+        self.frames.append((total, self.cur))
+        self.count += 1
+
+    # ----------------- Stats -----------------
+    def recent(self, n=None):
+        """The last n frames, oldest first (all if None); only those n are copied."""
+        if not n: return list(self.frames)
+        frames = list(itertools.islice(reversed(self.frames), n))
+        frames.reverse()
+        return frames
+
+    def totals(self, n=None):
+        return np.array([f[0] for f in self.recent(n)])
+
+    def summary(self, n=None):
+        """p50/p95/p99 frame time and the mean cost of every phase over the last n frames (all if None)."""
+        frames = self.recent(n)
+        if not frames: return {}
+        p50, p95, p99 = np.percentile([f[0] for f in frames], [50, 95, 99])
+        return {"frames": len(frames), "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+                "phases_ms": {name: sum(f[1].get(name, 0.0) for f in frames) / len(frames) for name in self.phases}}
+
+    # ----------------- Export -----------------
+    def export(self, path):
+        """Write the recorded frames as CSV (one row per frame) or JSON, picked by the extension."""
+        if path.endswith(".json"):
+            data = {"summary": self.summary(),
+                    "frames": [dict(total_ms=round(t, 4), **{k: round(v, 4) for k, v in ph.items()})
+                               for t, ph in self.frames]}
+            with open(path, "w") as f:
+                json.dump(data, f, indent=1)
+            return
+        with open(path, "w") as f:
+            f.write(",".join(["frame", "total_ms"] + self.phases) + "\n")
+            for i, (t, ph) in enumerate(self.frames):
+                f.write(",".join([str(i), f"{t:.4f}"] + [f"{ph.get(k, 0.0):.4f}" for k in self.phases]) + "\n")
+
+    # ----------------- Overlay -----------------
+    def draw(self, surf, x, y, w=250):
+        """Frame-time graph (last GRAPH_FRAMES frames) and a per-phase table, top-left at (x, y)."""
+        if not self.frames: return
+        # the table is re-rendered twice a second; the graph every frame
+        if self.panel is None or self.count % 30 == 0:
+            self.panel = self._table(w)
+        gh = 60
+        surf.blit(tinted_box(w, gh + self.panel.get_height() + 8, (0, 0, 0, 150)), (x, y))
+        ms = self.totals(self.GRAPH_FRAMES)
+        scale = gh / (2 * self.BUDGET_MS)
+        budget_y = y + gh - int(self.BUDGET_MS * scale)
+        surf.line((90, 160, 90), (x, budget_y), (x + w - 1, budget_y))
+        if len(ms) > 1:
+            xs = x + np.arange(len(ms)) * (w - 1) / (self.GRAPH_FRAMES - 1)
+            ys = y + gh - np.minimum(ms * scale, gh)
+            surf.lines((255, 220, 90), False, np.column_stack([xs, ys]).tolist())
+        surf.blit(self.panel, (x + 6, y + gh + 4))
+
+    def _table(self, w):
+        s = self.summary(60)
+        font = get_font(16)
+        rows = [("frame p50/p95/p99", f"{s['p50_ms']:.2f} / {s['p95_ms']:.2f} / {s['p99_ms']:.2f} ms")]
+        rows += [(name, f"{ms:.3f} ms") for name, ms in s["phases_ms"].items()]
+        lh = font.get_linesize(); pw = w - 12
+        panel = pygame.Surface((pw, lh * len(rows)), pygame.SRCALPHA)
+        for i, (name, value) in enumerate(rows):
+            panel.blit(font.render(name, True, (235, 235, 235)), (0, i * lh))
+            text = font.render(value, True, (255, 220, 90))
+            panel.blit(text, (pw - text.get_width(), i * lh))
+        return panel
@@ -0,0 +1,186 @@
+"""
+Render backends for level drawing.
+Level draw code paints through a backend instead of straight onto a Surface,
+with blit/fill and the pygame.draw shapes as methods (rect, circle, line,
+lines, polygon); menus and other still screens keep painting the window
+Surface and show it with update().
+
+  SurfaceRenderer  software blits and pygame.draw onto the display surface,
+                   the path the games always used
+  TextureRenderer  a pygame._sdl2.video Renderer. A Surface is uploaded to a
+                   Texture the first time it is drawn and kept while the
+                   Surface lives; subsurfaces (atlas frames) copy out of their
+                   parent's texture, so the packed sprite sheet goes up once.
+                   Filled and 1 px rects and 1 px lines are renderer calls;
+                   other shapes are drawn once into a small Surface with
+                   pygame.draw and copied like a sprite after that.
+
+As with render_text, a Surface must not change after it has been drawn:
+the texture would keep showing the old pixels. TextureRenderer asks for SDL's
+software renderer unless opened as "texture-gpu" (and falls back to it when
+no GPU driver is found), so it runs on machines without a GPU.
+"""
+import weakref
+import pygame
+from pygame._sdl2 import sdl2, video
+
+BACKENDS = ("surface", "texture", "texture-gpu")
+ACTIVE = None   # backend of the open window, for update()
+
+class SurfaceRenderer:
+    name = "surface"
+
+    def __init__(self, surf):
+        self.surf = surf
+
+    def blit(self, img, pos, area=None):
+        self.surf.blit(img, pos, area)
+
+    def fill(self, color, rect=None):
+        self.surf.fill(color, rect)
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        pygame.draw.rect(self.surf, color, rect, width, border_radius)
+
+    def circle(self, color, center, radius, width=0):
+        pygame.draw.circle(self.surf, color, center, radius, width)
+
+    def line(self, color, start, end, width=1):
+        pygame.draw.line(self.surf, color, start, end, width)
+
+    def lines(self, color, closed, points):
+        pygame.draw.lines(self.surf, color, closed, points)
+
+    def polygon(self, color, points):
+        pygame.draw.polygon(self.surf, color, points)
+
+    def present(self):
+        pygame.display.update()
+
+    def show(self, rects=None):
+        if rects is None: pygame.display.update()
+        else: pygame.display.update(rects)
+
+    def close(self):
+        pygame.display.quit()
+
+class TextureRenderer:
+    def __init__(self, window, gpu=False):
+        self.name = "texture-gpu" if gpu else "texture"
+        self.window = window
+        try: self.renderer = video.Renderer(window, accelerated=1 if gpu else 0)
+        except sdl2.error: self.renderer = video.Renderer(window, accelerated=0)   # no GPU driver
+        self.textures = weakref.WeakKeyDictionary()   # Surface -> Texture
+        self.shapes = {}   # (shape, colour, size, geometry) -> Texture
+        self.colors = {}   # colour tuple -> pygame.Color, which draw_color wants
+        self.surf = pygame.Surface(window.size)   # what menus paint; see show()
+        self.screen = None
+
+    def texture(self, surf):
+        tex = self.textures.get(surf)
+        if tex is None:
+            tex = self.textures[surf] = video.Texture.from_surface(self.renderer, surf)
+        return tex
+
+    def color(self, c):
+        col = self.colors.get(c)
+        if col is None: col = self.colors[c] = pygame.Color(c)
+        self.renderer.draw_color = col
+
+    def blit(self, img, pos, area=None):
+        parent = img.get_abs_parent()
+        x, y = img.get_abs_offset()
+        if area is None: w, h = img.get_size()
+        else: ax, ay, w, h = area; x += ax; y += ay
+        self.texture(parent).draw((x, y, w, h), (pos[0], pos[1], w, h))
+
+    def fill(self, color, rect=None):
+        self.color(color)
+        if rect is None: self.renderer.clear()
+        else: self.renderer.fill_rect(rect)
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        if border_radius <= 0 and width <= 1:
+            self.color(color)
+            if width: self.renderer.draw_rect(rect)
+            else: self.renderer.fill_rect(rect)
+            return
+        x, y, w, h = rect
+        self.shape(("rect", color, (w, h), width, border_radius), (w, h), (x, y),
+                   lambda s: pygame.draw.rect(s, color, (0, 0, w, h), width, border_radius))
+
+    def circle(self, color, center, radius, width=0):
+        d = 2 * radius + 2
+        self.shape(("circle", color, radius, width), (d, d), (center[0] - radius - 1, center[1] - radius - 1),
+                   lambda s: pygame.draw.circle(s, color, (radius + 1, radius + 1), radius, width))
+
+    def line(self, color, start, end, width=1):
+        if width <= 1:
+            self.color(color); self.renderer.draw_line(start, end)
+        else:
+            self.outline("line", color, (start, end), width,
+                         lambda s, pts: pygame.draw.line(s, color, pts[0], pts[1], width))
+
+    def lines(self, color, closed, points):
+        self.color(color)
+        draw = self.renderer.draw_line
+        for a, b in zip(points, points[1:]): draw(a, b)
+        if closed and len(points) > 2: draw(points[-1], points[0])
+
+    def polygon(self, color, points):
+        self.outline("polygon", color, points, 1, lambda s, pts: pygame.draw.polygon(s, color, pts))
+
+    def outline(self, kind, color, points, pad, paint):
+        # shapes given by points are cached by their geometry relative to the top-left
+        x0 = min(p[0] for p in points) - pad; y0 = min(p[1] for p in points) - pad
+        rel = tuple((p[0] - x0, p[1] - y0) for p in points)
+        size = (max(p[0] for p in rel) + pad + 1, max(p[1] for p in rel) + pad + 1)
+        self.shape((kind, color, rel, pad), size, (x0, y0), lambda s: paint(s, rel))
+
+    def shape(self, key, size, pos, paint):
+        tex = self.shapes.get(key)
+        if tex is None:
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            paint(surf)
+            tex = self.shapes[key] = video.Texture.from_surface(self.renderer, surf)
+        tex.draw(None, (pos[0], pos[1], size[0], size[1]))
+
+    def present(self):
+        self.renderer.present()
+
+    def show(self, rects=None):
+        # the whole menu Surface goes up each time: menus redraw a few times a second at most
+        if self.screen is None:
+            self.screen = video.Texture(self.renderer, self.surf.get_size(), streaming=True)
+        self.screen.update(self.surf)
+        self.screen.draw()
+        self.renderer.present()
+
+    def close(self):
+        self.textures.clear(); self.shapes.clear(); self.screen = None
+        del self.renderer
+        self.window.destroy()
+
+def open(name, size, title):
+    """Open the window for backend name: (Surface menus paint, backend levels draw through)."""
+    global ACTIVE
+    if name not in BACKENDS: raise ValueError(f"unknown render backend {name!r}; one of {', '.join(BACKENDS)}")
+    if name == "surface":
+        surf = pygame.display.set_mode(size)
+        pygame.display.set_caption(title)
+        ACTIVE = SurfaceRenderer(surf)
+    else:
+        pygame.display.init()   # no-op unless a SurfaceRenderer closed it
+        ACTIVE = TextureRenderer(video.Window(title, size), gpu=name == "texture-gpu")
+    return ACTIVE.surf, ACTIVE
+
+def close():
+    global ACTIVE
+    if ACTIVE: ACTIVE.close()
+    ACTIVE = None
+
+def update(rects=None):
+    """Show the window Surface after a menu painted it (pygame.display.update for any backend)."""
+    if ACTIVE: ACTIVE.show(rects)
+    elif rects is None: pygame.display.update()
+    else: pygame.display.update(rects)
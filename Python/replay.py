@@ -0,0 +1,145 @@
+"""
+Input recording and replay.
+A replay is the key state the player code read on every frame, stored as runs:
+(frames the state lasted, bitmask of held keys and of keys that went down
+that frame), both as varints. A level where nothing changes for a minute
+costs a few bytes. Levels follow each other in one file, each opened by a small JSON header (world, sublevel, abilities, score),
+so a whole session fits in one log that is read back as it is played.
+The header also names the level generator and sim versions it was recorded
+with; a level recorded against other ones is refused instead of playing out
+differently.
+"""
+import json, struct, atexit
+import pygame
+import levelgen
+from engine import KeyState
+
+MAGIC = b"NRPL"
+VERSION = 2    # 2: key-down bits; version 1 (held keys only) is refused, see Replay
+_FILE_HEADER = struct.Struct("<4sB")   # magic, version
+_META_LEN = struct.Struct("<I")
+SIM = 1   # bump whenever a change to the level step makes the same inputs play out differently
+
+# bit i of a mask is KEYS[i] held, bit DOWNS + i is KEYS[i] went down; only ever append to this order
+# key-ups are not stored: no player code reads them
+KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+        pygame.K_LSHIFT, pygame.K_x, pygame.K_c, pygame.K_f, pygame.K_z)
+DOWNS = 16
+
+def key_mask(keys):
+    """Bitmask of KEYS held in (and gone down during) keys, a KeyState."""
+    mask = 0
+    for i, k in enumerate(KEYS):
+        if keys[k]: mask |= 1 << i
+        if keys.pressed(k): mask |= 1 << (DOWNS + i)
+    return mask
+
+def mask_keys(mask):
+    return KeyState((k for i, k in enumerate(KEYS) if mask >> i & 1),
+                    (k for i, k in enumerate(KEYS) if mask >> (DOWNS + i) & 1))
+
+def write_varint(f, n):
+    out = bytearray()
+    while n >= 0x80:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+    f.write(out)
+
+def read_varint(f):
+    n = shift = 0
+    while True:
+        b = f.read(1)
+        if not b: raise EOFError
+        n |= (b[0] & 0x7F) << shift
+        if b[0] < 0x80: return n
+        shift += 7
+
+class Recorder:
+    """
+    Streams one session to path. begin(meta) opens a level, record(keys) is
+    called once per frame with exactly what the player code reads, end() closes
+    the level. Whatever is open is flushed at interpreter exit.
+    """
+    def __init__(self, path):
+        self.f = open(path, "wb")
+        self.f.write(_FILE_HEADER.pack(MAGIC, VERSION))
+        self.mask = None
+        self.run = 0
+        atexit.register(self.close)
+
+    def begin(self, meta):
+        self.end()
+        blob = json.dumps(dict(meta, levelgen=levelgen.VERSION, sim=SIM), separators=(",", ":")).encode()
+        self.f.write(_META_LEN.pack(len(blob)))
+        self.f.write(blob)
+        self.mask, self.run = 0, 0
+
+    def record(self, keys):
+        mask = key_mask(keys)
+        if mask != self.mask and self.run:
+            write_varint(self.f, self.run); write_varint(self.f, self.mask)
+            self.run = 0
+        self.mask = mask
+        self.run += 1
+
+    def end(self):
+        if self.mask is None: return
+        if self.run:
+            write_varint(self.f, self.run); write_varint(self.f, self.mask)
+        write_varint(self.f, 0)   # a zero-length run ends the level
+        self.mask = None
+        self.f.flush()
+
+    def close(self):
+        if self.f.closed: return
+        self.end()
+        self.f.close()
+
+class Replay:
+    """
+    Reads a recorded session back lazily: iterating yields (meta, inputs) per
+    level, where inputs yields one KeyState per frame straight from the file.
+    Consume (or drop) each level's inputs before asking for the next level.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            magic, version = _FILE_HEADER.unpack(f.read(_FILE_HEADER.size))
+            if magic != MAGIC or not 1 <= version <= VERSION:
+                raise ValueError(f"{self.path}: not a replay")
+            if version < 2:
+                # jumps and throws fire on a key going down, which version 1 did not store
+                raise ValueError(f"{self.path}: replay format {version} has no key-down bits "
+                                 f"and cannot be played by this build; record it again")
+            while True:
+                head = f.read(_META_LEN.size)
+                if len(head) < _META_LEN.size: return
+                meta = json.loads(f.read(_META_LEN.unpack(head)[0]))
+                made = (meta.get("levelgen"), meta.get("sim"))
+                if made != (levelgen.VERSION, SIM):
+                    raise ValueError(f"{self.path}: recorded with level generator {made[0]} and sim {made[1]}, "
+                                     f"this build has {levelgen.VERSION} and {SIM}")
+                runs = self._runs(f)
+                yield meta, self._frames(runs)
+                for _ in runs: pass   # skip whatever the caller did not play
+
+    @staticmethod
+    def _runs(f):
+        while True:
+            try:
+                n = read_varint(f)
+                if n == 0: return
+                yield n, read_varint(f)
+            except EOFError:
+                return   # session cut off mid-level (e.g. the game was killed)
+
+    @staticmethod
+    def _frames(runs):
+        states = {}
+        for n, mask in runs:
+            state = states.get(mask) or states.setdefault(mask, mask_keys(mask))
+            for _ in range(n):
+                yield state
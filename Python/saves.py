@@ -0,0 +1,103 @@
+"""
+Write-behind progress saves.
+The game thread only hands over a snapshot; a background thread lets bursts
+settle, then writes a compact binary copy and the JSON, each to a temp file
+that is renamed over the old one, so a crash mid-write never leaves a torn save.
+"""
+import os, json, struct, threading, time, atexit
+
+MAGIC = b"NSAV"
+VERSION = 1
+# magic, version, world_unlocked, scrolls, ability bitmask, coins
+_HEADER = struct.Struct("<4sBBBHI")
+
+def pack(data, ability_keys):
+    # ability bit i is ability_keys[i]; only ever append to that order
+    bits = 0
+    for i, k in enumerate(ability_keys):
+        if data["abilities"].get(k): bits |= 1 << i
+    return _HEADER.pack(MAGIC, VERSION, data["world_unlocked"], data["scrolls"], bits, data["coins"])
+
+def unpack(blob, ability_keys):
+    magic, version, world, scrolls, bits, coins = _HEADER.unpack(blob[:_HEADER.size])
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a save file")
+    abilities = {k: bool(bits >> i & 1) for i, k in enumerate(ability_keys)}
+    return {"world_unlocked": world, "scrolls": scrolls, "abilities": abilities, "coins": coins}
+
+def atomic_write(path, payload):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+class SaveWriter:
+    """
+    save(data) returns at once; the newest snapshot wins if several arrive
+    within `settle` seconds. flush() blocks until everything is on disk and is
+    also run at interpreter exit.
+    """
+    def __init__(self, json_path, bin_path, ability_keys, settle=0.25):
+        self.json_path = json_path
+        self.bin_path = bin_path
+        self.ability_keys = list(ability_keys)
+        self.settle = settle
+        self.cond = threading.Condition()
+        self.pending = None
+        self.busy = False
+        self.thread = None
+        atexit.register(self.flush)
+
+    def load(self):
+        """Saved progress, or None. The binary copy is used unless the JSON is newer or it is unreadable."""
+        try:
+            if os.path.getmtime(self.bin_path) >= os.path.getmtime(self.json_path):
+                with open(self.bin_path, "rb") as f:
+                    return unpack(f.read(), self.ability_keys)
+        except (OSError, ValueError, struct.error):
+            pass
+        if not os.path.exists(self.json_path):
+            return None
+        with open(self.json_path, "r") as f:
+            return json.load(f)
+
+    def save(self, data):
+        # snapshot now: the caller keeps mutating its dict
+        snap = dict(data, abilities=dict(data["abilities"]))
+        with self.cond:
+            self.pending = snap
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+                self.thread.start()
+            self.cond.notify_all()
+
+    def flush(self, timeout=5.0):
+        end = time.monotonic() + timeout
+        with self.cond:
+            while self.pending is not None or self.busy:
+                left = end - time.monotonic()
+                if left <= 0: return False
+                self.cond.wait(left)
+        return True
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.pending is None:
+                    self.cond.wait()
+                self.busy = True
+            time.sleep(self.settle)   # coalesce a burst of checkpoints into one write
+            with self.cond:
+                snap, self.pending = self.pending, None
+            try:
+                # JSON first so the binary copy is never older than it
+                atomic_write(self.json_path, json.dumps(snap, separators=(",", ":")).encode())
+                atomic_write(self.bin_path, pack(snap, self.ability_keys))
+            except Exception as e:   # not only OSError: a bad value must not kill the writer
+                print("Save failed:", e)
+            finally:
+                with self.cond:
+                    self.busy = self.pending is not None
+                    self.cond.notify_all()
@@ -1,19 +1,45 @@
-import pygame, sys, os, json, math, random
-pygame.init()
+import time
+STARTUP_T0 = time.perf_counter()
+import pygame, sys, math, functools, atexit
+import numpy as np
+import engine, saves, replay, profiler, levelgen, audio, controls, render
+from engine import NO_KEYS, GLOW_PAD, Actor, Camera, CoinStore, EnemyStore, Platform, ProjectilePool, SpatialHash, SpriteAtlas, render_text, run_screen, scripted_inputs, sweep, tinted_box
+from assets import AssetManager, cached_pack, try_image
 
 # ----------------- Window / Global -----------------
 WIDTH, HEIGHT = 960, 540
-window = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("The Ten Ninja Scrolls")
+window = None   # opened by init_display(); importing this module opens nothing
+SCREEN = None   # render backend levels draw through (see render.py); menus paint window
+RENDER = "surface"   # --render surface|texture|texture-gpu
 clock = pygame.time.Clock()
 FPS = 60
 
+def init_display(backend=None):
+    """Open the window (again, if backend differs from the open one) and return the Surface menus paint."""
+    global window, SCREEN
+    backend=backend or RENDER
+    if SCREEN and SCREEN.name!=backend:
+        render.close(); window=SCREEN=None
+    if window is None:
+        audio.pre_init()   # small mixer buffer: must precede pygame.init()
+        pygame.init()
+        window, SCREEN = render.open(backend, (WIDTH, HEIGHT), "The Ten Ninja Scrolls")
+        SFX.open()
+    return window
+
 # Physics
 GRAVITY = 0.6
 MOVE_SPEED = 5
 JUMP_POWER = -12
 DOUBLE_JUMP_POWER = -11
 DASH_SPEED = 12
+SHURIKEN_SPEED = 9
+SHURIKEN_LIFE = 120   # frames (~1 screen width of flight)
+SWEEP_AT = 16         # px: moves longer than the thinnest platform go through engine.sweep()
+JUMP_BUFFER = 6       # ticks a jump press is remembered before landing
+COYOTE = 6            # ticks after leaving the ground the ground jump still works
+SLOWMO_SCALE = 0.5    # Time Slow: world ticks per player tick
+MAX_STEPS = 5         # sim steps one rendered frame may catch up before the backlog is dropped
 TILE = 48
 
 # Colors
@@ -22,105 +48,75 @@ INK=(25,25,25); GOLD=(255,215,0); RED=(220,70,70)
 
 # Save file
 SAVE_FILE = "ninja_progress.json"
+SAVE_BIN = "ninja_progress.bin"   # compact copy for fast loads, written next to the JSON
 
 # ----------------- Assets -----------------
-def load_sheet(path, fw, fh):
-    img = pygame.image.load(path).convert_alpha()
-    cols = img.get_width()//fw
-    return [img.subsurface(pygame.Rect(i*fw,0,fw,fh)) for i in range(cols)]
-
-def safe_sheet(path, fw, fh):
-    try: return load_sheet(path, fw, fh)
-    except: return []
-
-def safe_img(path):
-    try: return pygame.image.load(path).convert_alpha()
-    except: return None
-
-IDLE = safe_sheet("player_idle.png",48,48)
-RUN  = safe_sheet("player_run.png",48,48)
-JUMP = safe_sheet("player_jump.png",48,48)
-DJMP = safe_sheet("player_doublejump.png",48,48)
-
-EWALK = safe_sheet("enemy_walk.png",48,48)
-ESTOMP = safe_sheet("enemy_stomp.png",48,48)
-
-COIN = safe_sheet("coin.png",32,32)
+# Everything loads on first use (or on the prefetch worker while the map is up)
+ASSETS = AssetManager()
+
+SHEETS = [
+    ("IDLE","player_idle.png",48,48), ("RUN","player_run.png",48,48),
+    ("JUMP","player_jump.png",48,48), ("DJMP","player_doublejump.png",48,48),
+    ("EWALK","enemy_walk.png",48,48), ("ESTOMP","enemy_stomp.png",48,48),
+    ("COIN","coin.png",32,32),
+]
+# one packed texture with left-facing copies baked in, cached on disk pre-sliced
+ASSETS.register("atlas", functools.partial(cached_pack, SHEETS), lambda packed: SpriteAtlas(*packed))
+for _name in ("bg_sky","bg_mountains","bg_trees","bg_grass"):
+    ASSETS.register(_name, functools.partial(try_image, _name+".png"))
+LEVEL_ASSETS = ("atlas","bg_sky","bg_mountains","bg_trees","bg_grass")
 
-BG_SKY = safe_img("bg_sky.png")
-BG_MTN = safe_img("bg_mountains.png")
-BG_TRE = safe_img("bg_trees.png")
-BG_GRA = safe_img("bg_grass.png")
+# draw code looks frames up by (sheet, index, facing); first use loads it
+ATLAS = ASSETS.proxy("atlas")
 
 # Music
-try:
-    pygame.mixer.music.load("bg_music.wav")
-    pygame.mixer.music.set_volume(0.5)
-except:
-    pass
+def load_music():
+    try:
+        pygame.mixer.music.load("bg_music.wav")
+        pygame.mixer.music.set_volume(0.5)
+        return True
+    except:
+        return False
+ASSETS.register("music", load_music)
 
-# SFX (fallback beeps using pygame if you don’t have files)
-# eat_sfx = pygame.mixer.Sound(None)
-# hit_sfx = pygame.mixer.Sound(None)
+# SFX: decoded (or synthesized as beeps) when the display opens; silent until then
+SFX = audio.Audio()
 
 # ----------------- Parallax -----------------
-class Parallax:
+class Parallax(engine.Parallax):
     def __init__(self):
-        self.layers = [(BG_SKY,0.1),(BG_MTN,0.3),(BG_TRE,0.6),(BG_GRA,0.9)]
-    def draw(self, surf, camx):
-        surf.fill((120,180,255))
-        for img, speed in self.layers:
-            if not img: continue
-            w = img.get_width()
-            x = - (camx * speed) % w
-            surf.blit(img, (x-w,0)); surf.blit(img, (x,0)); surf.blit(img, (x+w,0))
-
-# ----------------- Level Geometry -----------------
-class Platform:
-    def __init__(self, rect): self.rect = pygame.Rect(rect)
-    def draw(self, surf, camx):
-        pygame.draw.rect(surf,(60,170,70),(self.rect.x-camx,self.rect.y,self.rect.w,self.rect.h))
+        get=ASSETS.get
+        super().__init__([(get("bg_sky"),0.1),(get("bg_mountains"),0.3),(get("bg_trees"),0.6),(get("bg_grass"),0.9)], WIDTH, HEIGHT)
 
 # ----------------- Collectibles -----------------
-class Coin:
-    def __init__(self, x,y):
-        self.rect = pygame.Rect(x,y,24,24)
-        self.t=0
-    def update(self): self.t+=1
-    def draw(self, surf, camx):
-        if COIN:
-            frame = COIN[(self.t//6)%len(COIN)]
-            surf.blit(frame,(self.rect.x-camx-4,self.rect.y-4))
+# coins are rows of an engine.CoinStore
+def draw_coins(surf, coins, camx, rows):
+    xs=coins.x[rows].tolist(); ys=coins.y[rows].tolist(); ts=coins.t[rows].tolist()
+    for x,y,t in zip(xs,ys,ts):
+        if ATLAS.has("COIN"):
+            surf.blit(ATLAS.frame("COIN",t//6),(x-camx-4,y-4))
         else:
-            pygame.draw.circle(surf,GOLD,(self.rect.x-camx+12,self.rect.y+12),12)
-    def collect(self, player): return self.rect.colliderect(player.rect)
+            surf.circle(GOLD,(x-camx+12,y+12),12)
 
 # ----------------- Enemies -----------------
-class Enemy:
-    def __init__(self,x,y,lbound,rbound):
-        self.rect=pygame.Rect(x,y,40,44)
-        self.vx=2
-        self.l=lbound; self.r=rbound
-        self.stomped=False; self.dead_time=0
-        self.hp=10
-    def update(self):
-        if self.stomped:
-            self.dead_time+=1
-            return
-        self.rect.x+=self.vx
-        if self.rect.x<self.l or self.rect.x>self.r: self.vx*=-1
-    def draw(self,surf,camx):
-        if self.stomped and ESTOMP:
-            surf.blit(ESTOMP[0],(self.rect.x-camx-4,self.rect.y-4))
-        elif EWALK:
-            frame = EWALK[(pygame.time.get_ticks()//120)%len(EWALK)]
-            img = pygame.transform.flip(frame, self.vx<0, False)
-            surf.blit(img,(self.rect.x-camx-4,self.rect.y-4))
+# enemies are rows of an engine.EnemyStore
+def draw_enemies(surf, enemies, camx, rows, x=None):
+    # x: interpolated column to draw instead of enemies.x
+    frame=pygame.time.get_ticks()//120
+    xs=(enemies.x if x is None else x)[rows].tolist(); ys=enemies.y[rows].tolist()
+    vxs=enemies.vx[rows].tolist(); stomped=enemies.stomped[rows].tolist()
+    for x,y,vx,dead in zip(xs,ys,vxs,stomped):
+        if dead and ATLAS.has("ESTOMP"):
+            surf.blit(ATLAS.frame("ESTOMP",0),(x-camx-4,y-4))
+        elif ATLAS.has("EWALK"):
+            surf.blit(ATLAS.frame("EWALK",frame,vx<0),(x-camx-4,y-4))
         else:
-            pygame.draw.rect(surf,RED,(self.rect.x-camx,self.rect.y,self.rect.w,self.rect.h))
+            surf.rect(RED,(x-camx,y,EnemyStore.W,EnemyStore.H))
 
 # ----------------- Boss (Template) -----------------
+@engine.component
 class Boss:
+    __slots__=("rect","vx","dir","left","right","hp","name","phase","cool")
     def __init__(self, x,y, arena_left, arena_right, name="Boss"):
         self.rect=pygame.Rect(x,y,64,64)
         self.vx=3; self.dir=1
@@ -142,37 +138,40 @@ class Boss:
             # little hop (fake)
     def hit(self, dmg=1):
         if self.hp>0: self.hp-=dmg
-    def draw(self,surf,camx):
+    def draw(self,surf,camx,x=None):
+        x=(self.rect.x if x is None else x)-camx
         # draw body
-        pygame.draw.rect(surf,(60,60,80),(self.rect.x-camx,self.rect.y,self.rect.w,self.rect.h),0,8)
+        surf.rect((60,60,80),(x,self.rect.y,self.rect.w,self.rect.h),0,8)
         # face slash lines
-        pygame.draw.line(surf,(200,0,0),(self.rect.x-camx+10,self.rect.y+20),(self.rect.x-camx+54,self.rect.y+24),3)
-        # HP bar
+        surf.line((200,0,0),(x+10,self.rect.y+20),(x+54,self.rect.y+24),3)
+    def draw_bar(self,surf):
+        # HP bar (screen space, drawn even while the body is off-screen)
         bar_w=300
-        pygame.draw.rect(surf,(40,40,40),(WIDTH//2-bar_w//2,20,bar_w,16),2)
+        surf.rect((40,40,40),(WIDTH//2-bar_w//2,20,bar_w,16),2)
         hp_w=int(bar_w*max(self.hp,0)/10)
-        pygame.draw.rect(surf,(220,70,70),(WIDTH//2-bar_w//2,20,hp_w,16))
-        font=pygame.font.SysFont(None,28)
-        surf.blit(font.render(self.name,True,WHITE),(WIDTH//2-60,42))
+        surf.rect((220,70,70),(WIDTH//2-bar_w//2,20,hp_w,16))
+        surf.blit(render_text(self.name,28,WHITE),(WIDTH//2-60,42))
 
 # ----------------- Player -----------------
-class Player:
+@engine.component
+class Player(Actor):
+    __slots__=("abilities","dash_cd","slowmo","focus","shadow_timer","invul","slide","sub_y","projectiles",
+               "prev_up","up_pressed","jump_buf","coyote")
     def __init__(self,x,y, abilities):
-        self.rect=pygame.Rect(x,y,40,46)
-        self.vx=0; self.vy=0
-        self.facing_left=False
-        self.on_ground=False
-        self.can_double=True
+        super().__init__(x,y)
         self.abilities=abilities
         self.dash_cd=0
         self.slowmo=False
         self.focus=100  # for slow-mo
         self.shadow_timer=0 # shadow form visual
-        self.anim_t=0
         self.invul=0
         self.slide=False
+        self.sub_y=0.0  # fraction of a px carried over while gliding
+        self.prev_up=False; self.up_pressed=False
+        self.jump_buf=0   # ticks a buffered jump press has left
+        self.coyote=0     # ticks the ground jump has left after leaving the ground
 
-        self.projectiles=[]  # shurikens: list of rect + vx
+        self.projectiles=ProjectilePool(w=10,h=4,life=SHURIKEN_LIFE)  # shurikens
 
     def handle_input(self, keys):
         self.vx=0
@@ -181,12 +180,21 @@ class Player:
         if keys[pygame.K_RIGHT]:
             self.vx= MOVE_SPEED; self.facing_left=False
 
-        # Jump / Double jump
-        if keys[pygame.K_UP]:
-            if self.on_ground:
+        # Jump / Double jump: on the press, so holding UP does not chain them.
+        # A press just before landing jumps on landing (jump buffer), and the
+        # ground jump still works just after running off an edge (coyote time).
+        up=keys[pygame.K_UP]
+        # without key-down bits (scripted input, the Gym env) a press is UP held now but not last tick
+        self.up_pressed=keys.pressed(pygame.K_UP) if keys.edges else up and not self.prev_up
+        self.prev_up=up
+        if self.up_pressed: self.jump_buf=JUMP_BUFFER
+        if self.jump_buf:
+            if self.on_ground or self.coyote:
                 self.vy=JUMP_POWER; self.on_ground=False; self.can_double=True
-            elif self.abilities["double_jump"] and self.can_double:
-                self.vy=DOUBLE_JUMP_POWER; self.can_double=False
+                self.jump_buf=0; self.coyote=0
+            elif self.up_pressed and self.abilities["double_jump"] and self.can_double:
+                self.vy=DOUBLE_JUMP_POWER; self.can_double=False; self.jump_buf=0
+            else: self.jump_buf-=1
 
         # Dash
         if self.abilities["dash"] and keys[pygame.K_LSHIFT] and self.dash_cd==0:
@@ -202,9 +210,8 @@ class Player:
         # Shuriken
         if self.abilities["shuriken"] and keys[pygame.K_x]:
             if len(self.projectiles)<3:
-                r=pygame.Rect(self.rect.centerx, self.rect.centery, 10, 4)
-                vx=9 * (-1 if self.facing_left else 1)
-                self.projectiles.append([r,vx])
+                vx=SHURIKEN_SPEED * (-1 if self.facing_left else 1)
+                if self.projectiles.spawn(self.rect.centerx, self.rect.centery, vx): SFX.play("shuriken")
 
         # Shadow clone (decoy)
         # press C to drop a decoy that distracts enemies (cosmetic)
@@ -217,34 +224,49 @@ class Player:
             if self.focus>0:
                 self.slowmo=True
 
-    def physics(self, platforms):
+    def physics(self, grid):
+        # grid: SpatialHash of the level's platforms; only look at ones the move can touch
         # Horizontal
-        self.rect.x += int(self.vx)
-        for p in platforms:
-            if self.rect.colliderect(p.rect):
-                if self.vx>0: self.rect.right=p.rect.left
-                elif self.vx<0: self.rect.left=p.rect.right
+        dx=int(self.vx)
+        if abs(dx)>SWEEP_AT:
+            # fast enough to pass a platform between frames: stop at the first one in the way
+            sweep(self.rect,dx,0,grid)
+        else:
+            near=grid.query(self.rect.union(self.rect.move(dx,0)))
+            self.rect.x += dx
+            for p in near:
+                if self.rect.colliderect(p.rect):
+                    if self.vx>0: self.rect.right=p.rect.left
+                    elif self.vx<0: self.rect.left=p.rect.right
 
         # Gravity + vertical
-        self.vy += (GRAVITY*0.6 if self.abilities["slowfall"] and not self.on_ground else GRAVITY)
-        self.rect.y += int(self.vy)
+        gliding=self.abilities["slowfall"] and not self.on_ground
+        self.vy += (GRAVITY*0.6 if gliding else GRAVITY)
+        if gliding and self.vy>0:
+            # slow fall descends at fractions of a px per frame: keep what int() drops
+            v=self.vy+self.sub_y; dy=int(v); self.sub_y=v-dy
+        else:
+            dy=int(self.vy); self.sub_y=0.0
         self.on_ground=False
-        for p in platforms:
-            if self.rect.colliderect(p.rect):
-                if self.vy>0:
-                    self.rect.bottom=p.rect.top; self.vy=0; self.on_ground=True; self.can_double=True
-                elif self.vy<0:
-                    self.rect.top=p.rect.bottom; self.vy=0
+        if abs(dy)>SWEEP_AT:
+            if sweep(self.rect,0,dy,grid):
+                if dy>0: self.on_ground=True; self.can_double=True
+                self.vy=0; self.sub_y=0.0
+        else:
+            near=grid.query(self.rect.union(self.rect.move(0,dy)))
+            self.rect.y += dy
+            for p in near:
+                if self.rect.colliderect(p.rect):
+                    if self.vy>0:
+                        self.rect.bottom=p.rect.top; self.vy=0; self.on_ground=True; self.can_double=True; self.sub_y=0.0
+                    elif self.vy<0:
+                        self.rect.top=p.rect.bottom; self.vy=0
+        self.coyote=COYOTE if self.on_ground else max(0,self.coyote-1)
 
         # cooldowns
         if self.dash_cd>0: self.dash_cd-=1
         if self.invul>0: self.invul-=1
 
-        # projectiles
-        for pr in self.projectiles[:]:
-            pr[0].x += pr[1]
-            if pr[0].x<-2000 or pr[0].x>5000: self.projectiles.remove(pr)
-
         # slow-mo drain
         if self.slowmo:
             self.focus -= 0.5
@@ -252,111 +274,97 @@ class Player:
         else:
             self.focus = min(100, self.focus+0.2)
 
-    def stomp_enemy(self, enemy):
-        feet=pygame.Rect(self.rect.x+6,self.rect.bottom-6,self.rect.w-12,8)
-        head=pygame.Rect(enemy.rect.x,enemy.rect.y,enemy.rect.w,10)
-        return self.vy>0 and feet.colliderect(head)
-
     def ground_slam(self, enemies):
         # Z to slam: small AoE beneath player
         # (Handled in level loop on keypress)
         pass
 
-    def wall_jump(self, platforms, keys):
+    def wall_jump(self, grid, keys):
         if not self.abilities["wall_jump"]: return
         touching_left=False; touching_right=False
+        near=grid.query(self.rect.inflate(2,0))
         self.rect.x -= 1
-        for p in platforms:
+        for p in near:
             if self.rect.colliderect(p.rect): touching_left=True; break
         self.rect.x += 2
-        for p in platforms:
+        for p in near:
             if self.rect.colliderect(p.rect): touching_right=True; break
         self.rect.x -=1
 
-        if (touching_left or touching_right) and keys[pygame.K_UP]:
+        if (touching_left or touching_right) and self.up_pressed:
             self.vy = JUMP_POWER
             self.vx = (MOVE_SPEED if touching_left else -MOVE_SPEED)
             self.on_ground=False
             self.can_double=True
 
-    def draw(self, surf, camx):
+    def draw(self, surf, camx, at=None, back=0.0):
+        # at: interpolated top-left to draw at; back: world ticks to rewind the shurikens by
         self.anim_t += 1
         # shadow form tint
         glow = self.abilities["shadow_form"]
 
         # choose frame
-        img=None
+        sheet=None; idx=0; left=self.facing_left
         if not self.on_ground:
-            if not self.can_double and DJMP: img=DJMP[0]
-            elif JUMP: img=JUMP[0]
+            if not self.can_double and ATLAS.has("DJMP"): sheet="DJMP"
+            elif ATLAS.has("JUMP"): sheet="JUMP"
         else:
-            if abs(self.vx)>0 and RUN: img = RUN[(self.anim_t//6)%len(RUN)]
-            elif IDLE: img = IDLE[(self.anim_t//10)%len(IDLE)]
-
-        if img:
-            img = pygame.transform.flip(img, self.facing_left, False)
-            if glow:
-                # simple glow: draw a tinted underlay
-                glow_surf = img.copy(); arr=pygame.PixelArray(glow_surf); arr.replace(arr.make_surface().map_rgb((0,0,0)), (0,0,0))
-                del arr
-            surf.blit(img,(self.rect.x-camx-4,self.rect.y-2))
+            if abs(self.vx)>0 and ATLAS.has("RUN"): sheet="RUN"; idx=self.anim_t//6
+            elif ATLAS.has("IDLE"): sheet="IDLE"; idx=self.anim_t//10
+
+        px,py=self.rect.topleft if at is None else at
+        x=px-camx-4; y=py-2
+        if sheet:
+            # effect variants are cached per frame in the atlas: each is one extra blit
+            if glow: surf.blit(ATLAS.variant(sheet,idx,left,"glow"),(x-GLOW_PAD,y-GLOW_PAD))
+            if self.invul>0 and (self.invul//4)%2: img=ATLAS.variant(sheet,idx,left,"flash")
+            else: img=ATLAS.frame(sheet,idx,left)
+            surf.blit(img,(x,y))
         else:
-            pygame.draw.rect(surf,(80,80,255),(self.rect.x-camx,self.rect.y,self.rect.w,self.rect.h))
+            surf.rect((80,80,255),(px-camx,py,self.rect.w,self.rect.h))
 
         # clone silhouette
         if self.shadow_timer>0:
             self.shadow_timer-=1
-            s=pygame.Surface((self.rect.w,self.rect.h),pygame.SRCALPHA)
-            s.fill((50,50,80,80))
-            surf.blit(s,(self.rect.x-camx,self.rect.y))
+            if sheet: surf.blit(ATLAS.variant(sheet,idx,left,"silhouette"),(x,y))
+            else: surf.blit(tinted_box(self.rect.w,self.rect.h,(50,50,80,80)),(px-camx,py))
 
-        # projectiles
-        for pr in self.projectiles:
-            pygame.draw.rect(surf,(200,200,200),(pr[0].x - camx, pr[0].y, pr[0].w, pr[0].h))
+        # projectiles (on-screen only)
+        pool=self.projectiles
+        for x,y in pool.rows(camx,camx+WIDTH,back):
+            surf.rect((200,200,200),(x-camx,y,pool.w,pool.h))
 
 # ----------------- Levels -----------------
-def build_level(world, sublevel):
+LEVELS = levelgen.LevelCache()   # generated stages, kept in memory and in .level_cache/
+LEVEL_SEED = 0   # same seed every visit: a stage is always the same level
+
+def build_level(world, sublevel, seed=LEVEL_SEED):
     """
-    world: 1..10, sublevel: 1,2 or 'boss'
-    We keep geometry lightweight and fun. You can expand later.
+    world: 1..10, sublevel: 1,2 or 'boss'; seed picks the generated layout
+    Levels 1 and 2 come from levelgen (long, world-themed); boss arenas are hand-made.
     """
-    platforms=[
-        Platform((-200,480,2600,60)),
-        Platform(( 200,420,180,16)),
-        Platform(( 500,360,180,16)),
-        Platform(( 820,320,200,16)),
-        Platform((1120,360,200,16)),
-        Platform((1420,300,200,16)),
-        Platform((1720,420,220,16)),
-    ]
-    coins=[Coin(230,380),Coin(520,320),Coin(850,280),Coin(1150,320),Coin(1450,260),Coin(1750,380)]
-    enemies=[Enemy(560,436,520,780), Enemy(1180,436,1120,1400), Enemy(1520,376,1480,1750)]
-
-    # slight variations per world for flavor
-    for p in platforms[1:]:
-        p.rect.y -= (world-1)*4
-    for e in enemies:
-        e.vx += (world-1)*0.1
-
-    # Boss arena
     boss=None
     flag_rect=None
     if sublevel=="boss":
         platforms=[Platform((-200,480,2400,60)), Platform((700,420,500,16)), Platform((1300,360,500,16))]
-        enemies=[]
+        coins=CoinStore([(230,380),(520,320),(850,280),(1150,320),(1450,260),(1750,380)])
+        enemies=EnemyStore()
         boss_names=["Wind Assassin","Moonblade Ninja","Fire Oni","Phantom Shinobi","Kappa General",
                     "Ronin Shogun","Raijin Monk","Stone Titan","Timekeeper Samurai","Shadow Grandmaster"]
         boss=Boss(1100,416,800,1600,name=boss_names[world-1])
     else:
+        level=LEVELS.get(world, sublevel, seed)
+        platforms=[Platform(r) for r in level["platforms"].tolist()]
+        coins=CoinStore(level["coins"])
+        enemies=EnemyStore(level["enemies"], float(level["vx"]))
         # Level end flag
-        flag_rect=pygame.Rect(2100,420,20,60)
+        flag_rect=pygame.Rect(level["flag"].tolist())
 
     return platforms, coins, enemies, boss, flag_rect
 
 # ----------------- HUD -----------------
 def draw_hud(surf, score, abilities, focus):
-    font=pygame.font.SysFont(None,28)
-    surf.blit(font.render(f"Score: {score}",True,BLACK),(12,12))
+    surf.blit(render_text(f"Score: {score}",28,BLACK),(12,12))
     # abilities icons (text)
     xs=12; ys=44
     show=[]
@@ -364,121 +372,240 @@ def draw_hud(surf, score, abilities, focus):
                        ("clone","CL"),("slam","SL"),("slide","SLD"),("slowmo","TM"),("shadow_form","SFm")]:
         if abilities[key]: show.append(label)
     if show:
-        surf.blit(font.render("Abilities: "+" ".join(show),True,(20,20,20)),(xs,ys))
+        surf.blit(render_text("Abilities: "+" ".join(show),28,(20,20,20)),(xs,ys))
     # Focus bar (for time slow)
-    pygame.draw.rect(surf,(30,30,30),(WIDTH-170,14,156,14),2)
-    pygame.draw.rect(surf,(80,180,255),(WIDTH-168,16,int( (focus/100)*152 ),10))
+    surf.rect((30,30,30),(WIDTH-170,14,156,14),2)
+    surf.rect((80,180,255),(WIDTH-168,16,int( (focus/100)*152 ),10))
 
 # ----------------- Pause -----------------
 def pause_menu():
-    while True:
-        for e in pygame.event.get():
-            if e.type==pygame.QUIT: pygame.quit(); sys.exit()
-            if e.type==pygame.KEYDOWN and e.key==pygame.K_ESCAPE: return
-        s=pygame.Surface((WIDTH,HEIGHT),pygame.SRCALPHA); s.fill((0,0,0,120))
-        window.blit(s,(0,0))
-        font=pygame.font.SysFont(None,54)
-        window.blit(font.render("PAUSED",True,WHITE),(WIDTH//2-100,HEIGHT//2-20))
-        pygame.display.update(); clock.tick(30)
-
-# ----------------- Level Loop -----------------
-def play_level(world, sublevel, abilities, score):
-    par=Parallax()
-    platforms, coins, enemies, boss, flag_rect = build_level(world, sublevel)
-    player=Player(100,380,abilities.copy())
-    camera_x=0
-    slow_factor=1.0
-
-    while True:
-        dt=clock.tick(FPS)
-        # slow-mo
-        slow_factor = 0.5 if player.slowmo else 1.0
-
-        for e in pygame.event.get():
-            if e.type==pygame.QUIT: pygame.quit(); sys.exit()
-            if e.type==pygame.KEYDOWN and e.key==pygame.K_ESCAPE: pause_menu()
-
-        keys=pygame.key.get_pressed()
-        player.handle_input(keys)
-        player.wall_jump(platforms, keys)
+    def draw(full):
+        # dim the frozen frame once; nothing changes until ESC
+        if full:
+            window.blit(tinted_box(WIDTH,HEIGHT,(0,0,0,120)),(0,0))
+            window.blit(render_text("PAUSED",54,WHITE),(WIDTH//2-100,HEIGHT//2-20))
+        return []
+    run_screen(draw, lambda e: True if e.key==pygame.K_ESCAPE else None)
+
+# ----------------- Simulation Core -----------------
+class LevelState:
+    """
+    Everything one level needs to run, advanced one fixed 1/FPS tick per step().
+    step() never draws or waits on the clock, so it runs headless as fast as Python allows.
+    The player moves every step; enemies, the boss and shurikens move in world
+    ticks, time_scale of them per step, which is how Time Slow slows the world.
+    """
+    def __init__(self, world, sublevel, abilities, score, seed=LEVEL_SEED):
+        self.abilities=abilities
+        self.platforms, self.coins, self.enemies, self.boss, self.flag_rect = build_level(world, sublevel, seed)
+        self.grid=SpatialHash(self.platforms)
+        self.player=Player(100,380,abilities.copy())
+        if abilities["shadow_form"] and pygame.display.get_surface(): ATLAS.warm(("glow",),("IDLE","RUN","JUMP","DJMP"))
+        self.score=score
+        self.camera=Camera(WIDTH,HEIGHT)
+        self.frame=0
+        self.time_scale=1.0; self.world_clock=0.0; self.ticks=0
+        self.prev=None
+
+    def remember(self):
+        """Keep what draw() interpolates from; call before each step() when rendering between steps."""
+        self.prev=(self.player.rect.topleft, self.camera.x, self.enemies.x.copy(),
+                   self.boss.rect.x if self.boss else 0)
+
+    def step(self, keys):
+        """Advance one tick; keys is anything indexable by pygame.K_*. Returns (result, score) once the level ends."""
+        player=self.player; grid=self.grid; enemies=self.enemies; boss=self.boss
+        lap=PROF.lap   # no-op unless profiling
+        self.frame+=1
+        player.handle_input(keys); lap("input")
+        player.wall_jump(grid, keys); lap("wall_jump")
 
         # ground slam
-        if abilities["slam"] and keys[pygame.K_z] and not player.on_ground and player.vy>0:
+        if self.abilities["slam"] and keys[pygame.K_z] and not player.on_ground and player.vy>0:
             # knock out nearby enemies below
             slam_rect = pygame.Rect(player.rect.centerx-40, player.rect.bottom, 80, 40)
-            for en in enemies:
-                if slam_rect.colliderect(en.rect): en.stomped=True
+            enemies.stomped |= enemies.hits(slam_rect)
             # little bounce
             player.vy = -6
 
-        # physics with slow-mo consideration (simplified: we don't alter actual physics; we alter dt feel)
-        player.physics(platforms)
-
-        # coins
-        for c in coins[:]:
-            c.update()
-            if c.collect(player):
-                coins.remove(c); score+=1
-
-        # enemies
-        for en in enemies[:]:
-            en.update()
-            # shuriken hit
-            for pr in player.projectiles[:]:
-                if en.rect.colliderect(pr[0]):
-                    en.stomped=True; player.projectiles.remove(pr)
-            # stomp
-            if not en.stomped and player.stomp_enemy(en):
-                en.stomped=True; player.vy = JUMP_POWER*0.6; score+=5
-            # collision kill
-            if not en.stomped and player.rect.colliderect(en.rect) and player.invul==0:
-                return ("dead", score)
-            # cleanup
-            if en.stomped and en.dead_time>30: enemies.remove(en)
+        # the player always moves at full speed; Time Slow only slows the world ticks below
+        player.physics(grid); lap("physics")
+
+        # coins (all at once over the store)
+        self.coins.update()
+        got=self.coins.collect(player.rect)
+        if got: self.score+=got; SFX.play("coin")
+        lap("coins")
+
+        # world ticks this step (1 normally, every other step under Time Slow)
+        self.time_scale=SLOWMO_SCALE if player.slowmo else 1.0
+        self.world_clock+=self.time_scale
+        ticks=self.ticks=int(self.world_clock); self.world_clock-=ticks
+
+        # enemies (shurikens fly on the same clock); only those that can reach the
+        # screen or a star are stepped, the rest follow their patrol in closed form
+        stars=player.projectiles
+        left,right=self.camera.left,self.camera.right
+        if len(stars): lo,hi=stars.span(); left=min(left,lo); right=max(right,hi)
+        for _ in range(ticks):
+            stars.update()
+            enemies.update((left,right))
+        # shuriken hit: one batched pass, each star stops in the first enemy it overlaps
+        if len(stars):
+            hit=stars.first_hits(enemies)
+            if (hit>=0).any():
+                enemies.stomped[hit[hit>=0]]=True; stars.remove(hit>=0); SFX.play("hit")
+        # stomp / collision kill
+        stomped, killed = enemies.contact(player.feet(), player.rect, player.vy>0, player.invul==0)
+        if stomped>=0: player.vy = JUMP_POWER*0.6; self.score+=5; SFX.play("stomp")
+        if killed: return ("dead", self.score)
+        # cleanup
+        enemies.cleanup(30); lap("enemies")
 
         # boss
         if boss:
-            boss.update(player)
-            # shuriken hits boss
-            for pr in player.projectiles[:]:
-                if boss.rect.colliderect(pr[0]) and boss.hp>0:
-                    boss.hit(1); player.projectiles.remove(pr)
+            for _ in range(ticks): boss.update(player)
+            # shuriken hits boss: one hp per star; stars past the killing blow fly on
+            if boss.hp>0 and len(player.projectiles):
+                hit=player.projectiles.hits(boss.rect)
+                spent=np.flatnonzero(hit)[boss.hp:]
+                hit[spent]=False
+                boss.hit(int(hit.sum())); player.projectiles.remove(hit)
+                if hit.any(): SFX.play("hit")
             # stomp boss (deal 1 damage)
-            feet = pygame.Rect(player.rect.x+6, player.rect.bottom-6, player.rect.w-12, 8)
-            if boss.hp > 0 and feet.colliderect(boss.rect) and player.vy > 0:
+            if boss.hp > 0 and player.feet().colliderect(boss.rect) and player.vy > 0:
                boss.hit(1)
                player.vy = JUMP_POWER * 0.6
+               SFX.play("stomp")
 
             # boss touch hurts
             if boss.hp>0 and player.rect.colliderect(boss.rect) and player.invul==0:
-                return ("dead", score)
+                return ("dead", self.score)
             # boss defeated?
             if boss.hp <= 0:
                 # boss death animation goes here later
-                return ("boss_down", score)
-
+                return ("boss_down", self.score)
+            lap("boss")
 
         # finish level (flag)
-        if flag_rect and player.rect.colliderect(flag_rect):
-            return ("win", score)
+        if self.flag_rect and player.rect.colliderect(self.flag_rect):
+            return ("win", self.score)
+        # fell into a pit
+        if player.rect.top>HEIGHT+200:
+            return ("dead", self.score)
 
         # camera
-        camera_x = max(0, int(player.rect.centerx - WIDTH*0.5))
+        self.camera.follow(player.rect); lap("camera")
+        return None
+
+    def draw(self, surf, par, alpha=1.0):
+        """alpha: how far between the previous step and this one to draw moving things (1 = as simulated)."""
+        # every world pass only touches what the camera can see
+        cam=self.camera; camera_x=cam.x; flag_rect=self.flag_rect; lap=PROF.lap
+        at=enemy_x=boss_x=None; back=0.0
+        if alpha<1 and self.prev:
+            (px,py),pcam,pex,pbx=self.prev; p=self.player.rect
+            at=(round(px+(p.x-px)*alpha), round(py+(p.y-py)*alpha))
+            camera_x=round(pcam+(cam.x-pcam)*alpha)
+            if len(pex)==len(self.enemies): enemy_x=pex+(self.enemies.x-pex)*alpha
+            if self.boss: boss_x=round(pbx+(self.boss.rect.x-pbx)*alpha)
+            back=(1-alpha)*self.ticks
+        par.draw(surf,camera_x); lap("draw.background")
+        for p in cam.visible(self.grid): p.draw(surf,camera_x)
+        if flag_rect and cam.sees(flag_rect.inflate(48,80)):
+            surf.rect(WHITE,(flag_rect.x-camera_x,flag_rect.y-40,4,100))
+            surf.polygon(RED,[(flag_rect.x-camera_x+4,flag_rect.y-40),
+                                          (flag_rect.x-camera_x+44,flag_rect.y-20),
+                                          (flag_rect.x-camera_x+4,flag_rect.y)])
+        lap("draw.platforms")
+        draw_coins(surf,self.coins,camera_x,cam.visible_rows(self.coins))
+        draw_enemies(surf,self.enemies,camera_x,cam.visible_rows(self.enemies),enemy_x); lap("draw.actors")
+        if self.boss:
+            if cam.sees(self.boss.rect): self.boss.draw(surf,camera_x,boss_x)
+            self.boss.draw_bar(surf); lap("draw.boss")
+        self.player.draw(surf,camera_x,at,back); lap("draw.player")
+        draw_hud(surf, self.score, self.abilities, self.player.focus); lap("draw.hud")
+
+def simulate_level(world, sublevel, abilities, score=0, inputs=(), max_frames=FPS*600):
+    """
+    Headless run of one level: no drawing, no clock, no event pump.
+    inputs yields one key state per frame (see engine.scripted_inputs); once it runs dry no keys are held.
+    Returns (result, score, frames); result is "timeout" if max_frames pass first.
+    """
+    level=LevelState(world, sublevel, abilities, score)
+    inputs=iter(inputs)
+    while level.frame<max_frames:
+        result=level.step(next(inputs, NO_KEYS))
+        if result: return result+(level.frame,)
+    return ("timeout", level.score, level.frame)
+
+# ----------------- Level Loop -----------------
+RECORDER = None   # replay.Recorder when started with --record FILE
+INPUT = controls.InputBuffer(replay.KEYS)   # keyboard events, drained once per sim step
+PROF = profiler.Profiler()   # F3 in a level: overlay; --profile FILE: record the whole run
+PROFILE_FILE = None
+
+def play_level(world, sublevel, abilities, score, inputs=None):
+    """
+    inputs: per-frame key states to play instead of the keyboard (a replay); the level stops where they end.
+    The sim runs fixed 1/FPS steps off an accumulator of real time, so game speed does not depend on
+    the frame rate; frames are drawn interpolated between the last two steps.
+    """
+    par=Parallax()
+    level=LevelState(world, sublevel, abilities, score)
+    if RECORDER: RECORDER.begin({"world":world,"sublevel":sublevel,"abilities":abilities,"score":score})
+    step_ms=1000/FPS
+    acc=step_ms   # first frame runs one step
+    clock.tick()  # start timing from here, not from the last menu
+    INPUT.sync(pygame.key.get_pressed())   # keys already down count as held, not pressed
+
+    while True:
+        acc+=clock.tick(FPS)
+        PROF.begin()
+
+        events=pygame.event.get()
+        INPUT.feed(events)
+        for e in events:
+            if e.type==pygame.QUIT: pygame.quit(); sys.exit()
+            if e.type==pygame.KEYDOWN and e.key==pygame.K_ESCAPE:
+                # the pause dims the frozen frame: menus paint window, so give it a software copy
+                if not isinstance(SCREEN, render.SurfaceRenderer): level.draw(render.SurfaceRenderer(window), par, acc/step_ms)
+                pause_menu(); clock.tick(); PROF.begin()  # the pause is not sim time
+                INPUT.sync(pygame.key.get_pressed())
+            if e.type==pygame.KEYDOWN and e.key==pygame.K_F3: PROF.toggle_overlay(PROFILE_FILE is not None)
+            if e.type==pygame.KEYDOWN and e.key==pygame.K_F4 and PROF.frames:
+                PROF.export("ninja_profile.csv"); print("profile written to ninja_profile.csv")
+        PROF.lap("events")
+
+        # catch the sim up with real time: several steps on a slow frame, none on a fast one
+        steps=0
+        while acc>=step_ms:
+            if steps==MAX_STEPS:
+                acc%=step_ms; break   # too far behind: drop the backlog rather than spiral
+            keys=INPUT.tick() if inputs is None else next(inputs, None)
+            if keys is None: return ("replay_end", level.score)
+            if RECORDER: RECORDER.record(keys)
+            level.remember()
+            result=level.step(keys)
+            if result:
+                if RECORDER: RECORDER.end()
+                if result[0]=="dead": SFX.play("dead")
+                return result
+            acc-=step_ms; steps+=1
 
         # draw
-        par.draw(window,camera_x)
-        for p in platforms: p.draw(window,camera_x)
-        if flag_rect:
-            pygame.draw.rect(window,WHITE,(flag_rect.x-camera_x,flag_rect.y-40,4,100))
-            pygame.draw.polygon(window,RED,[(flag_rect.x-camera_x+4,flag_rect.y-40),
-                                            (flag_rect.x-camera_x+44,flag_rect.y-20),
-                                            (flag_rect.x-camera_x+4,flag_rect.y)])
-        for c in coins: c.draw(window,camera_x)
-        for en in enemies: en.draw(window,camera_x)
-        if boss: boss.draw(window,camera_x)
-        player.draw(window,camera_x)
-        draw_hud(window, score, abilities, player.focus)
-        pygame.display.update()
+        level.draw(SCREEN, par, acc/step_ms)
+        if PROF.overlay: PROF.draw(SCREEN, WIDTH-262, 36); PROF.lap("draw.overlay")
+        SCREEN.present()
+        INPUT.presented()
+        PROF.lap("display.update"); PROF.end()
+
+def watch_replay(path):
+    """--replay FILE: play a recorded session back on screen, level by level."""
+    init_display()
+    for meta, inputs in replay.Replay(path):
+        result, score = play_level(meta["world"], meta["sublevel"], meta["abilities"], meta["score"], inputs)
+        print(f"world {meta['world']} level {meta['sublevel']}: {result}, score {score}")
 
 # ----------------- Story / Progress -----------------
 DEFAULT_ABILITIES = {
@@ -512,18 +639,27 @@ UNLOCK_ORDER = [
     "shadow_form"    # W10
 ]
 
+def abilities_for(world):
+    """What the player has on entering `world`: the defaults plus every earlier boss reward."""
+    ab=DEFAULT_ABILITIES.copy()
+    for key in UNLOCK_ORDER[:world-1]: ab[key]=True
+    return ab
+
+# background writer: atomic temp-file + rename, bursts coalesced, flushed at exit
+SAVES = saves.SaveWriter(SAVE_FILE, SAVE_BIN, DEFAULT_ABILITIES)
+
 def load_progress():
-    if not os.path.exists(SAVE_FILE):
+    data=SAVES.load()
+    if data is None:
         return {"world_unlocked":1, "scrolls":0, "abilities":DEFAULT_ABILITIES.copy(), "coins":0}
-    with open(SAVE_FILE,"r") as f:
-        data=json.load(f)
-    # ensure keys
+    # ensure keys (older JSON saves)
     for k in DEFAULT_ABILITIES:
         if k not in data["abilities"]: data["abilities"][k]=DEFAULT_ABILITIES[k]
     return data
 
 def save_progress(data):
-    with open(SAVE_FILE,"w") as f: json.dump(data,f,indent=2)
+    # returns immediately; the write happens off the game thread
+    SAVES.save(data)
 
 # ----------------- Map (Japanese Scroll Style) -----------------
 def draw_parchment_bg(surf):
@@ -539,67 +675,82 @@ def draw_parchment_bg(surf):
 def world_map_screen(progress):
     # music
     try:
-        if not pygame.mixer.music.get_busy(): pygame.mixer.music.play(-1)
+        if ASSETS.get("music") and not pygame.mixer.music.get_busy(): pygame.mixer.music.play(-1)
     except: pass
-
-    index=0
-    running=True
-    while running:
-        for e in pygame.event.get():
-            if e.type==pygame.QUIT: pygame.quit(); sys.exit()
-            if e.type==pygame.KEYDOWN:
-                if e.key==pygame.K_LEFT: index=max(0,index-1)
-                if e.key==pygame.K_RIGHT: index=min(9,index+1)
-                if e.key==pygame.K_RETURN:
-                    if index+1 <= progress["world_unlocked"]:
-                        return index+1   # selected world to play
-                if e.key==pygame.K_ESCAPE:
-                    return None
-
-        draw_parchment_bg(window)
-        # title
-        title=pygame.font.SysFont(None,52).render("THE TEN NINJA SCROLLS",True,INK)
-        window.blit(title,(WIDTH//2 - title.get_width()//2, 40))
-
-        # nodes
-        start_x=80; spacing=(WIDTH-160)//9
-        for i in range(10):
-            x = start_x + spacing*i
-            y = HEIGHT//2 + int(50*math.sin(i))
-            unlocked = (i+1) <= progress["world_unlocked"]
-            cleared  = (i+1) < progress["world_unlocked"]
-            color = (40,40,40) if unlocked else (120,120,120)
-            pygame.draw.circle(window,color,(x,y),16)
-            # label
-            lab=pygame.font.SysFont(None,24).render(str(i+1),True,WHITE)
-            window.blit(lab,(x-8,y-10))
-            # completed red stamp
-            if cleared:
-                pygame.draw.circle(window,(180,30,30),(x,y),20,3)
+    # decode level art and build the newest stage on workers while the player picks a world
+    ASSETS.prefetch(LEVEL_ASSETS)
+    LEVELS.prefetch(progress["world_unlocked"], 1, LEVEL_SEED)
+
+    start_x=80; spacing=(WIDTH-160)//9
+    def node_pos(i): return start_x + spacing*i, HEIGHT//2 + int(50*math.sin(i))
+
+    # parchment, title and nodes never change while the map is up: paint them once
+    base=pygame.Surface((WIDTH,HEIGHT))
+    draw_parchment_bg(base)
+    # title
+    title=render_text("THE TEN NINJA SCROLLS",52,INK)
+    base.blit(title,(WIDTH//2 - title.get_width()//2, 40))
+
+    # nodes
+    for i in range(10):
+        x, y = node_pos(i)
+        unlocked = (i+1) <= progress["world_unlocked"]
+        cleared  = (i+1) < progress["world_unlocked"]
+        color = (40,40,40) if unlocked else (120,120,120)
+        pygame.draw.circle(base,color,(x,y),16)
+        # label
+        lab=render_text(str(i+1),24,WHITE)
+        base.blit(lab,(x-8,y-10))
+        # completed red stamp
+        if cleared:
+            pygame.draw.circle(base,(180,30,30),(x,y),20,3)
+
+    info_band=pygame.Rect(0,HEIGHT-124,WIDTH,80)
+    sel={"index":0, "shown":0}
+
+    def draw(full):
+        index=sel["index"]
+        if full:
+            window.blit(base,(0,0)); dirty=None
+        else:
+            # repaint only the old/new selector and the info text from the cached base
+            dirty=[info_band]
+            for i in (sel["shown"], index):
+                x, y = node_pos(i); dirty.append(pygame.Rect(x-23,y-23,46,46))
+            for r in dirty: window.blit(base,r,r)
+        sel["shown"]=index
 
         # selector brush mark
-        sel_x = start_x + spacing*index
-        sel_y = HEIGHT//2 + int(50*math.sin(index))
-        pygame.draw.circle(window,(0,0,0),(sel_x,sel_y),22,3)
+        pygame.draw.circle(window,(0,0,0),node_pos(index),22,3)
 
         # world info
-        name_txt = pygame.font.SysFont(None,36).render(WORLD_NAMES[index],True,(40,40,40))
+        name_txt = render_text(WORLD_NAMES[index],36,(40,40,40))
         window.blit(name_txt,(WIDTH//2 - name_txt.get_width()//2, HEIGHT-120))
 
         # lock text
         if index+1 > progress["world_unlocked"]:
-            lock_txt = pygame.font.SysFont(None,26).render("Sealed: recover earlier scrolls to enter",True,(80,20,20))
+            lock_txt = render_text("Sealed: recover earlier scrolls to enter",26,(80,20,20))
             window.blit(lock_txt,(WIDTH//2 - lock_txt.get_width()//2, HEIGHT-80))
         else:
-            hint_txt = pygame.font.SysFont(None,26).render("Press Enter to play",True,(20,60,20))
+            hint_txt = render_text("Press Enter to play",26,(20,60,20))
             window.blit(hint_txt,(WIDTH//2 - hint_txt.get_width()//2, HEIGHT-80))
+        return dirty
+
+    def on_key(e):
+        index=sel["index"]
+        if e.key==pygame.K_LEFT: sel["index"]=max(0,index-1)
+        if e.key==pygame.K_RIGHT: sel["index"]=min(9,index+1)
+        if e.key==pygame.K_RETURN:
+            if index+1 <= progress["world_unlocked"]:
+                return index+1   # selected world to play
+        if e.key==pygame.K_ESCAPE:
+            return "back"
 
-        pygame.display.update()
-        clock.tick(60)
+    choice=run_screen(draw, on_key)
+    return None if choice=="back" else choice
 
 # ----------------- Cutscenes -----------------
 def scroll_unlocked_cutscene(world_idx, ability_key):
-    t=0
     msg1=f"Scroll {world_idx} recovered!"
     pretty={
         "double_jump":"Double Jump",
@@ -614,31 +765,24 @@ def scroll_unlocked_cutscene(world_idx, ability_key):
         "shadow_form":"Shadow Form",
     }
     msg2=f"New Ability: {pretty.get(ability_key, ability_key)}"
-    while t<180:
+    def draw(full):
         window.fill((10,10,10))
-        font1=pygame.font.SysFont(None,56)
-        font2=pygame.font.SysFont(None,36)
-        window.blit(font1.render(msg1,True,WHITE),(WIDTH//2-220,HEIGHT//2-40))
-        window.blit(font2.render(msg2,True,(200,220,255)),(WIDTH//2-220,HEIGHT//2+10))
-        pygame.display.update(); clock.tick(60); t+=1
+        window.blit(render_text(msg1,56,WHITE),(WIDTH//2-220,HEIGHT//2-40))
+        window.blit(render_text(msg2,36,(200,220,255)),(WIDTH//2-220,HEIGHT//2+10))
+    run_screen(draw, duration_ms=3000)
 
 # ----------------- Main Flow -----------------
+def draw_main_menu(full=True):
+    window.fill((15,15,25))
+    window.blit(render_text("THE TEN NINJA SCROLLS",64,WHITE),(WIDTH//2-350,160))
+    window.blit(render_text("Press Enter",30,(200,220,255)),(WIDTH//2-70,260))
+    window.blit(render_text("Arrow keys to move; ↑ jump; Shift=dash; X=shuriken; F=time slow",30,(180,180,180)),(WIDTH//2-360,320))
+
 def main_menu():
     try:
-        if not pygame.mixer.music.get_busy(): pygame.mixer.music.play(-1)
+        if ASSETS.get("music") and not pygame.mixer.music.get_busy(): pygame.mixer.music.play(-1)
     except: pass
-
-    while True:
-        for e in pygame.event.get():
-            if e.type==pygame.QUIT: pygame.quit(); sys.exit()
-            if e.type==pygame.KEYDOWN and e.key==pygame.K_RETURN: return
-        window.fill((15,15,25))
-        f1=pygame.font.SysFont(None,64)
-        f2=pygame.font.SysFont(None,30)
-        window.blit(f1.render("THE TEN NINJA SCROLLS",True,WHITE),(WIDTH//2-350,160))
-        window.blit(f2.render("Press Enter",True,(200,220,255)),(WIDTH//2-70,260))
-        window.blit(f2.render("Arrow keys to move; ↑ jump; Shift=dash; X=shuriken; F=time slow",True,(180,180,180)),(WIDTH//2-360,320))
-        pygame.display.update(); clock.tick(60)
+    run_screen(draw_main_menu, lambda e: True if e.key==pygame.K_RETURN else None)
 
 def run_world(world_idx, progress):
     """
@@ -648,15 +792,18 @@ def run_world(world_idx, progress):
     # local abilities copy
     abilities = progress["abilities"]
 
-    # Level 1
+    # Level 1 (level 2 is generated in the background meanwhile)
+    LEVELS.prefetch(world_idx, 2, LEVEL_SEED)
     result, score = play_level(world_idx, 1, abilities, progress["coins"])
     if result=="dead": return progress  # retry from map
     progress["coins"]=score
+    save_progress(progress)  # checkpoint
 
     # Level 2
     result, score = play_level(world_idx, 2, abilities, progress["coins"])
     if result=="dead": return progress
     progress["coins"]=score
+    save_progress(progress)  # checkpoint
 
     # Boss
     result, score = play_level(world_idx, "boss", abilities, progress["coins"])
@@ -670,11 +817,21 @@ def run_world(world_idx, progress):
 
     ability_key = UNLOCK_ORDER[world_idx-1]
     progress["abilities"][ability_key]=True
+    save_progress(progress)  # written while the cutscene plays
     scroll_unlocked_cutscene(world_idx, ability_key)
-    save_progress(progress)
     return progress
 
+def startup_time():
+    """--startup-time: show the main menu once, print how long that took since import began, and exit."""
+    init_display()
+    load_progress()
+    draw_main_menu()
+    render.update()
+    print(f"startup: {(time.perf_counter()-STARTUP_T0)*1000:.0f} ms to main menu")
+    pygame.quit()
+
 def main():
+    init_display()
     progress = load_progress()
     main_menu()
 
@@ -687,5 +844,54 @@ def main():
         # Play selected world if unlocked (enforced in map)
         progress = run_world(w, progress)
 
+def headless_replay(path):
+    """--headless --replay FILE: re-simulate a recorded session without a window, as a check or a benchmark."""
+    for meta, inputs in replay.Replay(path):
+        level=LevelState(meta["world"], meta["sublevel"], meta["abilities"], meta["score"])
+        result=None
+        t0=time.perf_counter()
+        for keys in inputs:
+            result=level.step(keys)
+            if result: break
+        result=result or ("replay_end", level.score)
+        dt=time.perf_counter()-t0
+        print(f"world {meta['world']} level {meta['sublevel']}: {result[0]} after {level.frame} frames, score {result[1]} ({level.frame/max(dt,1e-9):.0f} frames/s)")
+
+def headless_main(args):
+    """python shadow_scrolls.py --headless [world] [sublevel] [frames]: run right and hop, print the outcome."""
+    world=int(args[0]) if args else 1
+    sublevel=args[1] if len(args)>1 else "1"
+    sublevel=int(sublevel) if sublevel.isdigit() else sublevel
+    frames=int(args[2]) if len(args)>2 else FPS*60
+    script=[(20,[pygame.K_RIGHT]),(1,[pygame.K_RIGHT,pygame.K_UP])]*(frames//21+1)
+    t0=time.perf_counter()
+    result, score, n = simulate_level(world, sublevel, DEFAULT_ABILITIES.copy(), 0, scripted_inputs(script), frames)
+    dt=time.perf_counter()-t0
+    print(f"{result}: score {score} after {n} frames ({n/max(dt,1e-9):.0f} frames/s)")
+
+def option(flag):
+    """Value after flag on the command line, or None."""
+    i=sys.argv.index(flag) if flag in sys.argv else -1
+    return sys.argv[i+1] if 0<=i<len(sys.argv)-1 else None
+
 if __name__=="__main__":
-    main()
+    if option("--render"): RENDER=option("--render")
+    if "--headless" in sys.argv and option("--replay"):
+        headless_replay(option("--replay"))
+    elif "--headless" in sys.argv:
+        headless_main([a for a in sys.argv[1:] if a!="--headless"])
+    elif "--startup-time" in sys.argv:
+        startup_time()
+    elif option("--replay"):
+        watch_replay(option("--replay"))
+    else:
+        if option("--record"): RECORDER=replay.Recorder(option("--record"))
+        if option("--profile"):
+            PROFILE_FILE=option("--profile"); PROF.enable()
+            atexit.register(lambda: PROF.export(PROFILE_FILE))
+        if "--latency" in sys.argv:
+            def latency_report():
+                for k,v in INPUT.report().items(): print(f"input {k}: {v}")
+                print(f"audio buffer: {audio.latency_ms():.1f} ms")
+            atexit.register(latency_report)
+        main()
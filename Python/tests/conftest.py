@@ -0,0 +1,6 @@
+# the game modules sit one level up and are imported by name; keep SDL off screen
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import engine
+engine.use_dummy_drivers()
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from engine import EnemyStore
+
+@pytest.mark.parametrize("vx", [2.0, 2.1, 2.5, 2.6, 3.0, 1.0, 0.4])
+def test_parked_rows_match_stepping_every_row(vx):
+    """A store stepped with a moving window must agree with one stepped in full, tick for tick."""
+    rng = np.random.default_rng(0)
+    rows = []
+    for i in range(800):
+        x = rng.uniform(0, 20000); w = rng.uniform(0, 400)
+        # every third start is off the pixel grid: those rows must stay awake
+        rows.append((round(x) if i % 3 else x, 436, x - rng.uniform(0, 300), x + w))
+    full = EnemyStore(rows, vx); lod = EnemyStore(rows, vx)
+    cam = 0.0
+    for t in range(3000):
+        # mostly scrolling, now and then a jump across the level
+        cam = rng.uniform(0, 20000) if t % 400 == 399 else (cam + rng.uniform(-20, 40)) % 20000
+        if t % 500 == 17:
+            # stomp some on-screen rows in both (only rows in the window are ever touched)
+            hit = np.flatnonzero((full.x > cam) & (full.x < cam + 960))[:20]
+            full.stomped[hit] = True; lod.stomped[hit] = True
+        if t % 700 == 3:
+            keep = ~(full.stomped & (full.t > 30))
+            full.keep(keep); lod.keep(keep)
+        full.update(); lod.update((cam - 1200, cam + 2100))
+        x, v = lod.current()
+        assert (x == full.x).all() and (v == full.vx).all(), f"tick {t}"
+
+def test_window_none_wakes_everything():
+    rows = [(float(x), 436, x - 100, x + 100) for x in range(0, 20000, 250)]
+    full = EnemyStore(rows); lod = EnemyStore(rows)
+    for t in range(200):
+        full.update(); lod.update((0, 960))
+    assert lod.parked.any()
+    full.update(); lod.update()
+    assert not lod.parked.any() and (lod.x == full.x).all() and (lod.vx == full.vx).all()
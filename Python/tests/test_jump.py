@@ -0,0 +1,70 @@
+import collections
+import pygame
+import shadow_scrolls as S
+from controls import InputBuffer
+from engine import KeyState, Platform, SpatialHash
+from pygame import K_UP, K_RIGHT
+
+GROUND = SpatialHash([Platform((0, 500, 600, 40))])
+HOLD_UP = KeyState({K_UP}, ()); PRESS_UP = KeyState({K_UP}, {K_UP}); NONE = KeyState((), ())
+
+def player(x=100, y=454, land=True, **abilities):
+    p = S.Player(x, y, dict(S.DEFAULT_ABILITIES, **abilities))
+    while land and not p.on_ground: step(p, NONE)   # settle onto the ground
+    return p
+
+def step(p, keys):
+    p.handle_input(keys); p.wall_jump(GROUND, keys); p.physics(GROUND)
+
+def jumped(p):
+    return p.vy == S.JUMP_POWER + S.GRAVITY
+
+def test_holding_up_does_not_chain_the_double_jump():
+    for press, hold in ((PRESS_UP, HOLD_UP), (KeyState({K_UP}), KeyState({K_UP}))):   # with and without key-down bits
+        p = player(double_jump=True)
+        step(p, press)
+        assert jumped(p)
+        for _ in range(40):
+            step(p, hold)
+            assert p.vy != S.DOUBLE_JUMP_POWER + S.GRAVITY
+        assert p.can_double
+
+def test_a_tap_inside_one_tick_still_jumps():
+    buf = InputBuffer((K_UP,))
+    buf.feed([pygame.event.Event(pygame.KEYDOWN, key=K_UP), pygame.event.Event(pygame.KEYUP, key=K_UP)])
+    keys = buf.tick()
+    assert not keys[K_UP] and keys.pressed(K_UP) and keys.released(K_UP)
+    p = player(); step(p, keys)
+    assert jumped(p)
+    assert not buf.tick().pressed(K_UP)   # the edge lasts one tick
+
+def test_up_held_when_the_level_starts_is_not_a_press():
+    buf = InputBuffer((K_UP,))
+    buf.sync(collections.defaultdict(bool, {K_UP: True}))
+    p = player()
+    for _ in range(10):
+        step(p, buf.tick())
+        assert p.vy >= 0
+
+def landing_tick(p):
+    for t in range(200):
+        step(p, NONE)
+        if p.on_ground: return t
+
+def test_a_press_just_before_landing_jumps_on_landing():
+    land = landing_tick(player(y=200, land=False, double_jump=False))
+    for early, jumps in ((S.JUMP_BUFFER - 2, True), (S.JUMP_BUFFER + 6, False)):
+        p = player(y=200, land=False, double_jump=False)
+        for t in range(land + 3):
+            step(p, PRESS_UP if t == land - early else NONE)
+        assert (p.vy < 0) == jumps, early
+
+def test_a_press_just_after_leaving_an_edge_still_jumps():
+    for late, jumps in ((S.COYOTE - 2, True), (S.COYOTE + 4, False)):
+        p = player(x=550, double_jump=False)
+        off = 0   # ticks since the player last stood on something
+        while p.rect.left < 600 or off < late:
+            step(p, KeyState({K_RIGHT}, ()))
+            off = 0 if p.on_ground else off + 1
+        step(p, PRESS_UP)
+        assert (p.vy < 0) == jumps, late
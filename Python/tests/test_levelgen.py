@@ -0,0 +1,23 @@
+import pytest
+import levelgen
+from levelgen import GROUND_Y
+
+LEVELS = [(w, s, seed) for w in range(1, 11) for s in (1, 2) for seed in (0, 1, 2)]
+
+@pytest.mark.parametrize("world,sublevel,seed", LEVELS)
+def test_climbs_stay_apart_and_off_the_flag(world, sublevel, seed):
+    level = levelgen.generate(world, sublevel, seed)
+    floats = sorted(tuple(p) for p in level["platforms"].tolist() if p[1] < GROUND_Y)
+    for (x0, _, w0, _), (x1, _, _, _) in zip(floats, floats[1:]):
+        assert x1 >= x0 + w0 + 40, "floating platforms overlap or touch"
+    flag_x = int(level["flag"][0])
+    assert all(x + w <= flag_x - 120 for x, _, w, _ in floats), "a climb covers the flag"
+    # coins over open ground must not sit under a climb (the ones on a climb are centred on it)
+    on_floats = {(x + w // 2 - 12, y - 40) for x, y, w, _ in floats}
+    for cx, cy in level["coins"].tolist():
+        if cy == GROUND_Y - 100 and (cx, cy) not in on_floats:
+            assert not any(x - 40 <= cx <= x + w + 40 for x, _, w, _ in floats), "ground coin under a climb"
+
+def test_same_key_same_level():
+    a = levelgen.generate(3, 2, 7); b = levelgen.generate(3, 2, 7)
+    assert all((a[k] == b[k]).all() for k in levelgen.FIELDS)
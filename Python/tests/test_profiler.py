@@ -0,0 +1,22 @@
+import pygame
+import profiler, render
+
+def test_table_rebuilds_twice_a_second_after_history_fills():
+    pygame.font.init()
+    prof = profiler.Profiler(history=300); prof.enable()
+    built = []
+    table = prof._table
+    prof._table = lambda w: built.append(1) or table(w)
+    out = render.SurfaceRenderer(pygame.Surface((400, 300)))
+    for _ in range(600):
+        prof.begin(); prof.lap("update"); prof.end()
+        prof.draw(out, 0, 0)
+    assert len(built) == 1 + 600 // 30
+
+def test_recent_is_the_tail_in_order():
+    prof = profiler.Profiler(history=50); prof.enable()
+    for _ in range(80):
+        prof.begin(); prof.end()
+    tail = list(prof.frames)
+    assert prof.recent(7) == tail[-7:] and prof.recent() == tail and prof.recent(500) == tail
+    assert len(prof.totals(10)) == 10 and prof.summary(10)["frames"] == 10
@@ -0,0 +1,43 @@
+import json
+import pytest
+import levelgen, replay
+
+def write_v1(path):
+    """A version 1 file: held-key masks only, no key-down bits."""
+    with open(path, "wb") as f:
+        f.write(replay._FILE_HEADER.pack(replay.MAGIC, 1))
+        blob = json.dumps({"world": 1, "sublevel": 1, "levelgen": levelgen.VERSION, "sim": replay.SIM}).encode()
+        f.write(replay._META_LEN.pack(len(blob))); f.write(blob)
+        for n, mask in ((30, 0), (12, 0b10), (1, 0b110), (40, 0b10)):
+            replay.write_varint(f, n); replay.write_varint(f, mask)
+        replay.write_varint(f, 0)
+
+def test_version_1_is_refused(tmp_path):
+    path = tmp_path / "old.nrp"
+    write_v1(path)
+    with pytest.raises(ValueError, match="key-down"):
+        for meta, inputs in replay.Replay(path):
+            list(inputs)
+
+def test_round_trip_keeps_held_and_down_keys(tmp_path):
+    path = tmp_path / "s.nrp"
+    masks = [0] * 20 + [0b10] + [0b10 | 1 << replay.DOWNS + 2] + [0b110] * 5 + [1 << replay.DOWNS + 8] + [0] * 3
+    rec = replay.Recorder(path)
+    rec.begin({"world": 2, "sublevel": 1})
+    for m in masks: rec.record(replay.mask_keys(m))
+    rec.begin({"world": 2, "sublevel": 2})
+    rec.record(replay.mask_keys(0))
+    rec.close()
+    levels = [(meta, [replay.key_mask(k) for k in inputs]) for meta, inputs in replay.Replay(path)]
+    assert [(m["world"], m["sublevel"]) for m, _ in levels] == [(2, 1), (2, 2)]
+    assert levels[0][1] == masks and levels[1][1] == [0]
+
+def test_other_level_generator_is_refused(tmp_path):
+    path = tmp_path / "s.nrp"
+    rec = replay.Recorder(path)
+    rec.begin({"world": 1, "sublevel": 1}); rec.record(replay.mask_keys(0))
+    rec.close()
+    raw = path.read_bytes().replace(b'"levelgen":%d' % levelgen.VERSION, b'"levelgen":0')
+    path.write_bytes(raw)
+    with pytest.raises(ValueError, match="level generator"):
+        list(replay.Replay(path))
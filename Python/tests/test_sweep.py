@@ -0,0 +1,37 @@
+import random
+import pygame
+from engine import SpatialHash, sweep
+
+class Box:
+    __slots__ = ("rect",)
+    def __init__(self, r): self.rect = pygame.Rect(r)
+
+def step_through(rect, dx, dy, boxes):
+    """Reference: move 1 px at a time and stop before the first overlap."""
+    d = int(dx or dy); s = 1 if d > 0 else -1
+    r = rect.copy()
+    for _ in range(abs(d)):
+        nxt = r.move(s, 0) if dx else r.move(0, s)
+        if any(nxt.colliderect(b.rect) for b in boxes): return r, True
+        r = nxt
+    return r, False
+
+def test_sweep_matches_a_1px_step_through():
+    rnd = random.Random(1)
+    checked = 0
+    for _ in range(20000):
+        boxes = [Box((rnd.randint(-300, 300), rnd.randint(-300, 300), rnd.randint(8, 200), rnd.choice((16, 16, 60))))
+                 for _ in range(6)]
+        rect = pygame.Rect(rnd.randint(-100, 100), rnd.randint(-100, 100), 40, 46)
+        if any(rect.colliderect(b.rect) for b in boxes): continue
+        dx, dy = (rnd.uniform(-120, 120), 0) if rnd.random() < 0.5 else (0, rnd.uniform(-120, 120))
+        want, blocked = step_through(rect, dx, dy, boxes)
+        got = rect.copy(); hit = sweep(got, dx, dy, SpatialHash(boxes))
+        assert got == want and (hit is not None) == blocked, (rect, dx, dy)
+        checked += 1
+    assert checked > 10000
+
+def test_sweep_stops_on_a_thin_platform_it_would_tunnel_through():
+    ground = Box((0, 500, 400, 16))
+    r = pygame.Rect(100, 300, 40, 46)
+    assert sweep(r, 0, 400, SpatialHash([ground])) is ground and r.bottom == 500
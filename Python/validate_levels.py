@@ -0,0 +1,157 @@
+"""
+Reachability check for shadow_scrolls levels.
+For each (world, sublevel) a search runs the real Player rules (handle_input,
+wall_jump, the slam bounce, physics) from the spawn point with the abilities a
+player has when entering that world, until every coin and the goal (the flag,
+or the boss's patrol lane in an arena) has been touched. Enemies are ignored:
+they can be stomped or waited out; this is about geometry.
+
+The search takes macro-actions (a key set held for a few frames), deduplicates
+states on (x, y) cells plus vy, ground contact, double jump and dash cooldown,
+and is best-first towards the leftmost object not yet touched. An object counts
+as unreachable when the reachable states run out, or after `budget` expansions
+aimed at it; the report then gives the closest the search got. Levels run in
+parallel on a process pool.
+
+    python validate_levels.py                     # all 10 worlds x (1, 2, boss)
+    python validate_levels.py --worlds 3-5 --sublevels 1,2 --jobs 4 --json report.json
+"""
+import os, sys, time, json, heapq, argparse, collections
+from multiprocessing import Pool
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+import shadow_scrolls as S
+from engine import KeyState
+
+MACRO = 6   # frames per action
+CELL = 8    # px; states in the same cell with similar velocity and the same flags count as one
+VY_STEP = 2
+K = pygame
+
+def actions(ab):
+    """Macro-actions as tuples of per-frame KeyStates."""
+    out = []
+    for d in ((), (K.K_LEFT,), (K.K_RIGHT,)):
+        hold = KeyState(d)
+        out.append((hold,) * MACRO)
+        out.append((KeyState(d + (K.K_UP,)),) + (hold,) * (MACRO-1))
+        if d and ab["dash"]: out.append((KeyState(d + (K.K_LSHIFT,)),) + (hold,) * (MACRO-1))
+        if d and ab["slide"]: out.append((KeyState(d + (K.K_DOWN,)),) * MACRO)
+        if ab["slam"]: out.append((KeyState(d + (K.K_z,)),) * MACRO)
+    return out
+
+def validate(task):
+    """Search one level; returns a report dict."""
+    world, sublevel, budget = task
+    t0 = time.perf_counter()
+    ab = S.abilities_for(world)
+    platforms, coins, _, boss, flag = S.build_level(world, sublevel)
+    grid = S.SpatialHash(platforms)
+    goal = flag if flag else pygame.Rect(boss.left, boss.rect.y, boss.right - boss.left + boss.rect.w, boss.rect.h)
+    # targets: every coin, then the goal; searched for left to right
+    targets = [pygame.Rect(x, y, coins.W, coins.H) for x, y in zip(coins.x.tolist(), coins.y.tolist())] + [goal]
+    order = sorted(range(len(targets)), key=lambda i: targets[i].x)
+    # targets bucketed by 64 px column so each frame only tests its neighbours
+    buckets = collections.defaultdict(list)
+    for i, r in enumerate(targets):
+        for c in range(r.left // 64, r.right // 64 + 1): buckets[c].append(i)
+    found = set(); closest = {}
+    acts = actions(ab)
+    player = S.Player(100, 380, ab)
+    fall_y = S.HEIGHT + 200
+
+    start = (100, 380, 0.0, 0.0, False, True, 0, 0, 0)
+    seen = {(100 // CELL, 380 // CELL, 0, False, True, False)}
+    states = [start]   # every distinct state reached, for re-aiming the search
+    heap = []; tick = 0
+    cur = None; spent = 0; best = None
+    while True:
+        # aim at the leftmost target not yet touched; give up on one after `budget` expansions
+        if cur is None or cur in found or spent > budget:
+            if cur is not None and cur not in found: closest[cur] = best
+            left = [i for i in order if i not in found and i not in closest]
+            if not left: break
+            cur = left[0]; spent = 0; best = None
+            tx, ty = targets[cur].center
+            heap = [(abs(st[0] + 20 - tx) + abs(st[1] + 23 - ty), i, st) for i, st in enumerate(states)]
+            heapq.heapify(heap); tick = len(states)
+        if not heap:
+            closest[cur] = best; cur = None; continue
+        d, _, (x, y, vy, sub_y, on_ground, can_double, dash_cd, jump_buf, coyote) = heapq.heappop(heap)
+        spent += 1
+        if best is None or d < best[0]: best = (d, (x, y))
+        for act in acts:
+            p = player
+            p.rect.x = x; p.rect.y = y; p.vy = vy; p.sub_y = sub_y
+            p.on_ground = on_ground; p.can_double = can_double; p.dash_cd = dash_cd
+            p.jump_buf = jump_buf; p.coyote = coyote; p.prev_up = False   # no macro ends holding UP
+            dead = False
+            for keys in act:
+                p.handle_input(keys)
+                p.wall_jump(grid, keys)
+                if ab["slam"] and keys[K.K_z] and not p.on_ground and p.vy > 0: p.vy = -6
+                p.physics(grid)
+                r = p.rect
+                if r.top > fall_y: dead = True; break
+                for c in {r.left // 64, (r.right - 1) // 64}:
+                    for i in buckets.get(c, ()):
+                        if i not in found and r.colliderect(targets[i]): found.add(i)
+            if dead: continue
+            state = (p.rect.x, p.rect.y, p.vy, p.sub_y, p.on_ground, p.can_double, p.dash_cd, p.jump_buf, p.coyote)
+            key = (p.rect.x // CELL, p.rect.y // CELL, int(p.vy) // VY_STEP, p.on_ground, p.can_double, p.dash_cd > 0)
+            if key in seen: continue
+            seen.add(key)
+            states.append(state)
+            tick += 1
+            heapq.heappush(heap, (abs(state[0] + 20 - tx) + abs(state[1] + 23 - ty), tick, state))
+
+    goal_i = len(targets) - 1
+    missing = [i for i in range(goal_i) if i not in found]
+    stuck = lambda i: closest[i][1] if closest.get(i) else None
+    return {
+        "world": world, "sublevel": sublevel, "ok": len(found) == len(targets),
+        "goal": "flag" if flag else "boss arena", "goal_reached": goal_i in found,
+        "coins": goal_i, "coins_reached": goal_i - len(missing),
+        "unreachable_coins": [targets[i].topleft for i in missing],
+        # nearest the search came to each missed object
+        "stuck_at": {f"{targets[i].x},{targets[i].y}": stuck(i) for i in missing + ([] if goal_i in found else [goal_i])},
+        "states": len(seen), "seconds": round(time.perf_counter() - t0, 2),
+    }
+
+def parse_worlds(text):
+    lo, _, hi = text.partition("-")
+    return list(range(int(lo), int(hi or lo) + 1))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Check every coin and goal of shadow_scrolls levels is reachable.")
+    ap.add_argument("--worlds", default="1-10", help="e.g. 3 or 2-6")
+    ap.add_argument("--sublevels", default="1,2,boss")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count())
+    ap.add_argument("--budget", type=int, default=20000, help="states expanded towards one object before calling it unreachable")
+    ap.add_argument("--json", help="write the full report here")
+    args = ap.parse_args(argv)
+
+    subs = [int(s) if s.isdigit() else s for s in args.sublevels.split(",")]
+    tasks = [(w, s, args.budget) for w in parse_worlds(args.worlds) for s in subs]
+    # the level cache is filled here once, so workers only read it
+    for w, s, _ in tasks:
+        if s != "boss": S.LEVELS.get(w, s, S.LEVEL_SEED)
+    t0 = time.perf_counter()
+    reports = []
+    with Pool(min(args.jobs, len(tasks))) as pool:
+        for rep in pool.imap_unordered(validate, tasks):
+            reports.append(rep)
+            line = f"world {rep['world']:>2} {str(rep['sublevel']):>4}: "
+            line += "ok" if rep["ok"] else (f"{rep['goal']} {'reached' if rep['goal_reached'] else 'UNREACHABLE'}, "
+                                            f"{rep['coins_reached']}/{rep['coins']} coins")
+            for obj, at in rep["stuck_at"].items(): line += f"\n    {obj} unreachable, closest approach {at}"
+            print(line + f"  ({rep['states']} states, {rep['seconds']} s)")
+    reports.sort(key=lambda r: (r["world"], str(r["sublevel"])))
+    bad = [r for r in reports if not r["ok"]]
+    print(f"{len(reports) - len(bad)}/{len(reports)} levels fully reachable in {time.perf_counter() - t0:.1f} s")
+    if args.json:
+        with open(args.json, "w") as f: json.dump(reports, f, indent=1)
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())